@@ -0,0 +1,259 @@
+"""
+データベース層（refsys/db/dao.py）のベンチマーク
+
+使い方:
+    python benchmarks/bench_db.py [--works 10000] [--seed 42] [--samples 1000] [--out result.json]
+
+合成コーパス（corpus.py）を一時DBに投入し、次の処理を計測して JSON で出力する:
+    insert        WorkDAO.create_many（チャンクごと）
+    get           WorkDAO.get（ランダムな文献）
+    list          WorkDAO.list_page（カーソルで先頭からページを辿る）
+    export        WorkDAO.iter_items（全件、チャンクごと）
+    verify_write  CheckDAO.create_many（文献1件分の検証結果ごと）
+    verify_write_buffered  CheckWriter（多数の文献分をまとめて書き込む、レイテンシは書き込みごと）
+
+各項目は ops/sec と1操作あたりの p50/p99 レイテンシ（ms）を持つ。
+ネットワークには接続しない。既存のデータには影響しない。
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import generate_items, generate_checks
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """最近傍順位法によるパーセンタイル"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(ops: int, elapsed: float, latencies: List[float]) -> Dict[str, Any]:
+    """計測結果を集計（latencies は1操作ごとの秒数）"""
+    latencies = sorted(latencies)
+    return {
+        "ops": ops,
+        "seconds": round(elapsed, 4),
+        "ops_per_sec": round(ops / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def bench_insert(works: int, seed: int, chunk_size: int) -> Dict[str, Any]:
+    """一括インポート（ops は文献数、レイテンシはチャンクごと）"""
+    from refsys.db.dao import WorkDAO
+    
+    latencies = []
+    chunk = []
+    start = time.perf_counter()
+    for item in generate_items(works, seed=seed):
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            t = time.perf_counter()
+            await WorkDAO.create_many(chunk, chunk_size=chunk_size)
+            latencies.append(time.perf_counter() - t)
+            chunk = []
+    if chunk:
+        t = time.perf_counter()
+        await WorkDAO.create_many(chunk, chunk_size=chunk_size)
+        latencies.append(time.perf_counter() - t)
+    
+    result = summarize(works, time.perf_counter() - start, latencies)
+    result["chunk_size"] = chunk_size
+    return result
+
+
+async def bench_get(work_ids: List[str]) -> Dict[str, Any]:
+    """1件取得"""
+    from refsys.db.dao import WorkDAO
+    
+    latencies = []
+    start = time.perf_counter()
+    for work_id in work_ids:
+        t = time.perf_counter()
+        work = await WorkDAO.get(work_id)
+        latencies.append(time.perf_counter() - t)
+        assert work is not None, work_id
+    return summarize(len(work_ids), time.perf_counter() - start, latencies)
+
+
+async def bench_list(pages: int, page_size: int) -> Dict[str, Any]:
+    """一覧のページング（ops はページ数）"""
+    from refsys.db.dao import WorkDAO
+    
+    latencies = []
+    cursor = None
+    count = 0
+    start = time.perf_counter()
+    for _ in range(pages):
+        t = time.perf_counter()
+        works, cursor = await WorkDAO.list_page(limit=page_size, cursor=cursor)
+        latencies.append(time.perf_counter() - t)
+        count += 1
+        if cursor is None:
+            break
+    
+    result = summarize(count, time.perf_counter() - start, latencies)
+    result["page_size"] = page_size
+    return result
+
+
+async def bench_export(order: str, chunk_size: int) -> Dict[str, Any]:
+    """全件のストリーミング読み出し（ops は文献数、レイテンシはチャンクごと）"""
+    from refsys.db.dao import WorkDAO
+    
+    latencies = []
+    count = 0
+    start = time.perf_counter()
+    t = start
+    async for _ in WorkDAO.iter_items(order=order, chunk_size=chunk_size):
+        count += 1
+        if count % chunk_size == 0:
+            now = time.perf_counter()
+            latencies.append(now - t)
+            t = now
+    
+    result = summarize(count, time.perf_counter() - start, latencies)
+    result["order"] = order
+    result["chunk_size"] = chunk_size
+    return result
+
+
+async def bench_verify_write(items, seed: int) -> Dict[str, Any]:
+    """検証結果の保存（文献1件分ずつ、ops は行数）"""
+    from refsys.db.dao import CheckDAO
+    
+    latencies = []
+    rows = 0
+    start = time.perf_counter()
+    for item in items:
+        checks = generate_checks(item, seed=seed)
+        t = time.perf_counter()
+        rows += await CheckDAO.create_many(checks)
+        latencies.append(time.perf_counter() - t)
+    
+    result = summarize(rows, time.perf_counter() - start, latencies)
+    result["works"] = len(latencies)
+    return result
+
+
+async def bench_verify_write_buffered(items, seed: int) -> Dict[str, Any]:
+    """検証結果の保存（CheckWriter 経由、ops は close までに書き込んだ行数、レイテンシは書き込みごと）
+    
+    add() はバッファに積むだけなので、実際の書き込み（flush）の所要時間を計測する。
+    """
+    from refsys.db.dao import CheckWriter
+    
+    latencies = []
+    
+    class TimedCheckWriter(CheckWriter):
+        async def flush(self) -> int:
+            t = time.perf_counter()
+            written = await super().flush()
+            if written:
+                latencies.append(time.perf_counter() - t)
+            return written
+    
+    writer = TimedCheckWriter()
+    rows = 0
+    start = time.perf_counter()
+    for item in items:
+        checks = generate_checks(item, seed=seed)
+        await writer.add(checks)
+        rows += len(checks)
+    await writer.close()
+    
+    result = summarize(rows, time.perf_counter() - start, latencies)
+    result["works"] = len(items)
+    result["flushes"] = len(latencies)
+    return result
+
+
+async def run_suite(args) -> Dict[str, Any]:
+    """全項目を順に計測"""
+    results: Dict[str, Any] = {}
+    
+    results["insert"] = await bench_insert(args.works, args.seed, args.chunk_size)
+    
+    # 計測対象の文献は seed から決まるので、実行ごとに同じになる
+    rng = random.Random(args.seed)
+    sample_ids = [f"syn_{rng.randrange(args.works):07d}" for _ in range(args.samples)]
+    results["get"] = await bench_get(sample_ids)
+    
+    results["list"] = await bench_list(args.pages, args.page_size)
+    results["export"] = await bench_export("created", args.chunk_size)
+    results["export_apa"] = await bench_export("apa", args.chunk_size)
+    
+    verify_count = min(args.samples, args.works)
+    items = list(generate_items(verify_count, seed=args.seed))
+    results["verify_write"] = await bench_verify_write(items, args.seed)
+    results["verify_write_buffered"] = await bench_verify_write_buffered(items, args.seed)
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--works", type=int, default=10_000, help="合成文献数（1万〜100万）")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, default=1000, help="get / verify_write の操作数")
+    parser.add_argument("--pages", type=int, default=200, help="list で辿る最大ページ数")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--db-mode", choices=["default", "wal"], default=os.environ.get("REFSYS_DB_MODE", "default"))
+    parser.add_argument("--out", type=Path, help="JSON の出力先（省略時は標準出力）")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["REFSYS_DB_PATH"] = str(Path(tmp) / "bench.db")
+        os.environ["REFSYS_DB_MODE"] = args.db_mode
+        from refsys.db import init_database, run_with_pool
+        
+        # 標準出力は JSON のみにする
+        with contextlib.redirect_stdout(sys.stderr):
+            init_database()
+        results = run_with_pool(run_suite(args))
+    
+    report = {
+        "config": {
+            "works": args.works,
+            "seed": args.seed,
+            "samples": args.samples,
+            "pages": args.pages,
+            "page_size": args.page_size,
+            "chunk_size": args.chunk_size,
+            "db_mode": args.db_mode,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(output + "\n", encoding="utf-8")
+        print(f"✅ {args.out}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
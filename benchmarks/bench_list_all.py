@@ -0,0 +1,83 @@
+"""
+WorkDAO.list_all のレイテンシ計測
+
+使い方:
+    python benchmarks/bench_list_all.py [--sizes 100,1000,10000] [--repeat 5]
+
+一時ディレクトリにDBを作成するため、既存のデータには影響しない。
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_items(count: int):
+    """計測用の文献（1件あたり著者3名）"""
+    from refsys.models import CSLItem, CSLName, CSLDate
+    
+    return [
+        CSLItem(
+            id=f"bench_{i:07d}",
+            type="article-journal",
+            title=f"Benchmark work {i}",
+            author=[
+                CSLName(family=f"Family{(i + k) % 2000}", given=f"Given{k}")
+                for k in range(3)
+            ],
+            issued=CSLDate(**{"date-parts": [[2000 + i % 25]]}),
+            DOI=f"10.5555/bench.{i}"
+        )
+        for i in range(count)
+    ]
+
+
+async def bench(sizes, repeat):
+    from refsys.db.dao import WorkDAO
+    
+    inserted = 0
+    results = []
+    for size in sizes:
+        # 必要な件数まで追加
+        await WorkDAO.create_many(make_items(size)[inserted:])
+        inserted = size
+        
+        await WorkDAO.list_all(limit=size)  # ウォームアップ
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            works = await WorkDAO.list_all(limit=size)
+            timings.append(time.perf_counter() - start)
+        assert len(works) == size
+        
+        results.append((size, statistics.median(timings), min(timings)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["REFSYS_DB_PATH"] = str(Path(tmp) / "bench.db")
+        from refsys.db import init_database, run_with_pool
+        
+        init_database()
+        results = run_with_pool(bench(sizes, args.repeat))
+    
+    print(f"{'rows':>8} {'median ms':>10} {'min ms':>10}")
+    for size, median, best in results:
+        print(f"{size:>8} {median * 1000:>10.1f} {best * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
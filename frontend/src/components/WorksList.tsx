@@ -3,16 +3,23 @@
 import { useEffect, useState } from 'react'
 import Link from 'next/link'
 import { BookOpen, ExternalLink, CheckCircle, AlertTriangle, XCircle } from 'lucide-react'
-import { workApi, Work } from '@/lib/api'
+import { workApi, WorkSummary } from '@/lib/api'
 import { truncate } from '@/lib/utils'
 
 interface WorksListProps {
   showAll?: boolean
 }
 
+const PAGE_SIZE = 100
+
+const hasFailedCheck = (work: WorkSummary) =>
+  Object.values(work.check_status).some((status) => status === 'fail')
+
 export function WorksList({ showAll = false }: WorksListProps) {
-  const [works, setWorks] = useState<Work[]>([])
+  const [works, setWorks] = useState<WorkSummary[]>([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     loadWorks()
@@ -21,8 +28,9 @@ export function WorksList({ showAll = false }: WorksListProps) {
   const loadWorks = async () => {
     try {
       setLoading(true)
-      const data = await workApi.getWorks(showAll ? undefined : 10)
-      setWorks(data)
+      const page = await workApi.getWorksPage(showAll ? PAGE_SIZE : 10)
+      setWorks(page.works)
+      setNextCursor(showAll ? page.nextCursor : null)
     } catch (error) {
       console.error('Failed to load works:', error)
     } finally {
@@ -30,6 +38,20 @@ export function WorksList({ showAll = false }: WorksListProps) {
     }
   }
 
+  const loadMore = async () => {
+    if (!nextCursor) return
+    try {
+      setLoadingMore(true)
+      const page = await workApi.getWorksPage(PAGE_SIZE, nextCursor)
+      setWorks((prev) => [...prev, ...page.works])
+      setNextCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Failed to load more works:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   if (loading) {
     return (
       <div className="card">
@@ -104,17 +126,17 @@ export function WorksList({ showAll = false }: WorksListProps) {
                         {work.doi && (
                           <span className="badge badge-info text-xs">DOI</span>
                         )}
+                        {work.card_count > 0 && (
+                          <span className="badge badge-info text-xs">主張 {work.card_count}</span>
+                        )}
                       </div>
                     </div>
                   </div>
                 </td>
                 <td className="py-4 px-4">
                   <p className="text-sm text-gray-600">
-                    {work.authors && work.authors.length > 0
-                      ? truncate(
-                          work.authors.map(a => a.family).join(', '),
-                          30
-                        )
+                    {work.authors.length > 0
+                      ? truncate(work.authors.join(', '), 30)
                       : '—'}
                   </p>
                 </td>
@@ -124,7 +146,7 @@ export function WorksList({ showAll = false }: WorksListProps) {
                   </span>
                 </td>
                 <td className="py-4 px-4 text-center">
-                  {work.retracted ? (
+                  {work.retracted || hasFailedCheck(work) ? (
                     <XCircle className="w-5 h-5 text-red-500 mx-auto" />
                   ) : work.peer_reviewed === 1 ? (
                     <CheckCircle className="w-5 h-5 text-green-500 mx-auto" />
@@ -146,6 +168,18 @@ export function WorksList({ showAll = false }: WorksListProps) {
           </tbody>
         </table>
       </div>
+
+      {nextCursor && (
+        <div className="text-center mt-6">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="text-blue-600 hover:text-blue-700 text-sm font-medium disabled:opacity-50"
+          >
+            {loadingMore ? '読み込み中...' : 'さらに表示'}
+          </button>
+        </div>
+      )}
     </div>
   )
 }
@@ -24,8 +24,22 @@ export interface Work {
   citation_count?: number
 }
 
+// 一覧用の要約（著者は表示名、検証状況は種別ごとの最新ステータス）
+export interface WorkSummary extends Omit<Work, 'authors'> {
+  authors: string[]
+  check_status: Record<string, string>
+  last_checked_at?: string
+  card_count: number
+  evidence_count: number
+}
+
+export interface WorksPage {
+  works: WorkSummary[]
+  nextCursor: string | null
+}
+
 export interface Check {
-  id: string
+  id: string  // `${work_id}:${kind}`（種別ごとの最新結果を一意に示す）
   work_id: string
   check_type: string
   status: 'success' | 'warning' | 'error'
@@ -44,12 +58,22 @@ export interface ClaimCard {
 
 export const workApi = {
   // Works
-  async getWorks(limit?: number): Promise<Work[]> {
+  async getWorks(limit?: number): Promise<WorkSummary[]> {
     const params = limit ? { limit } : {}
     const { data } = await api.get('/api/works', { params })
     return data
   },
 
+  // カーソル方式のページング（nextCursor が null なら最終ページ）
+  async getWorksPage(limit: number, cursor?: string | null): Promise<WorksPage> {
+    const params = cursor ? { limit, cursor } : { limit }
+    const response = await api.get('/api/works', { params })
+    return {
+      works: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    }
+  },
+
   async getWork(id: string): Promise<Work> {
     const { data } = await api.get(`/api/works/${id}`)
     return data
@@ -4,22 +4,67 @@ RefSys CLI - コマンドラインインターフェース
 import click
 import asyncio
 import json
+from datetime import datetime
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
-from rich.progress import track
+from rich.progress import (
+    BarColumn, MofNCompleteColumn, Progress, ProgressColumn, TextColumn,
+    TimeRemainingColumn, track
+)
+from rich.text import Text
 
 from refsys.ingest import parse_csl_from_json_file, deduplicate_items
-from refsys.verify import verify_work, Verifier
+from refsys.verify import (
+    verify_many, check_rows, cache_stats, close_http_client, SQLiteCacheManager,
+    DEFAULT_BULK_CONCURRENCY, DEFAULT_PER_HOST_CONCURRENCY
+)
 from refsys.position import PositionAnalyzer, format_position_summary
-from refsys.format import ReferenceFormatter, export_to_bibtex
-from refsys.db.dao import WorkDAO, CheckDAO, ClaimCardDAO
-from refsys.db import init_database
+from refsys.format import ReferenceFormatter, export_to_bibtex, iter_bibliography
+from refsys.db.dao import (
+    WorkDAO, CheckDAO, ClaimCardDAO, SearchDAO, CheckWriter,
+    DEFAULT_IMPORT_CHUNK_SIZE, DEFAULT_STREAM_CHUNK_SIZE
+)
+from refsys.db import init_database, run_with_pool
 from refsys.readcheck import ClaimCard
 
 console = Console()
 
 
+class ThroughputColumn(ProgressColumn):
+    """処理速度（件/秒）"""
+    def render(self, task) -> Text:
+        if not task.speed:
+            return Text("- 件/秒", style="progress.data.speed")
+        return Text(f"{task.speed:.1f} 件/秒", style="progress.data.speed")
+
+
+def verification_progress() -> Progress:
+    """一括検証用の進捗バー（件数・速度・残り時間）"""
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        ThroughputColumn(),
+        TextColumn("残り"),
+        TimeRemainingColumn(),
+        console=console
+    )
+
+
+def print_cache_stats():
+    """この実行でのキャッシュのヒット率（メモリ・永続）"""
+    stats = cache_stats()
+    parts = []
+    for label, tier in (("メモリ", "memory"), ("永続", "persistent")):
+        counter = stats[tier]
+        lookups = counter['hits'] + counter['misses']
+        if lookups:
+            parts.append(f"{label} {counter['hits']}/{lookups} ヒット")
+    if parts:
+        console.print(f"💾 キャッシュ: {', '.join(parts)}", style="blue")
+
+
 @click.group()
 def cli():
     """RefSys: 正確な参考文献・引用テンプレ自動生成＋実在性/既読検証システム"""
@@ -36,11 +81,71 @@ def init():
         console.print(f"❌ エラー: {e}", style="red")
 
 
+@cli.command(name='import')
+@click.option('--in', 'input_file', required=True, type=click.Path(exists=True), help='入力CSL-JSONファイル')
+@click.option('--chunk-size', default=DEFAULT_IMPORT_CHUNK_SIZE, type=int, help='1トランザクションあたりの件数')
+@click.option('--analyze', is_flag=True, help='位置づけ分析（引用数取得）を行う')
+@click.option('--upsert', is_flag=True, help='登録済みの文献を更新する（内容が変わっていなければスキップ）')
+def import_works(input_file, chunk_size, analyze, upsert):
+    """文献をデータベースに一括インポート"""
+    console.print(f"📖 文献を読み込み中: {input_file}", style="cyan")
+    
+    try:
+        items = parse_csl_from_json_file(input_file)
+        console.print(f"✅ {len(items)}件の文献を読み込みました", style="green")
+        
+        # 重複排除
+        unique_items, duplicates = deduplicate_items(items)
+        if duplicates:
+            console.print(f"⚠️  {len(duplicates)}件の重複を除外しました", style="yellow")
+        
+        async def run_import():
+            if analyze:
+                # upsert 時は内容が変わっていない文献の分析を省く
+                skip = await WorkDAO.unchanged_ids(unique_items) if upsert else set()
+                targets = [item for item in unique_items if item.id not in skip]
+                try:
+                    async with PositionAnalyzer() as analyzer:
+                        for item in track(targets, description="分析中..."):
+                            position = await analyzer.analyze_work(item.to_dict())
+                            item.peer_reviewed = position.peer_reviewed
+                            item.consensus_score = position.consensus_score
+                            item.retracted = position.retracted
+                finally:
+                    await close_http_client()
+            
+            if upsert:
+                return await WorkDAO.upsert_many(unique_items, chunk_size=chunk_size)
+            return await WorkDAO.create_many(unique_items, chunk_size=chunk_size)
+        
+        outcomes = run_with_pool(run_import())
+        
+        created = [o for o in outcomes if o['status'] == 'created']
+        updated = [o for o in outcomes if o['status'] == 'updated']
+        unchanged = [o for o in outcomes if o['status'] == 'unchanged']
+        existing = [o for o in outcomes if o['status'] == 'exists']
+        errors = [o for o in outcomes if o['status'] == 'error']
+        
+        console.print(f"✅ {len(created)}件をインポートしました", style="green")
+        if upsert:
+            console.print(f"🔄 {len(updated)}件を更新、{len(unchanged)}件は変更なし", style="green")
+        if existing:
+            console.print(f"ℹ️  {len(existing)}件は登録済みのためスキップしました", style="blue")
+        for outcome in errors:
+            console.print(f"❌ {outcome['id']}: {outcome['error']}", style="red")
+    
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
 @cli.command()
 @click.option('--in', 'input_file', required=True, type=click.Path(exists=True), help='入力CSL-JSONファイル')
 @click.option('--update-cache', is_flag=True, help='キャッシュを更新')
 @click.option('--report', type=click.Path(), help='検証レポートの出力先')
-def verify(input_file, update_cache, report):
+@click.option('--concurrency', default=DEFAULT_BULK_CONCURRENCY, type=int, help='同時に検証する文献数')
+@click.option('--per-host', default=DEFAULT_PER_HOST_CONCURRENCY, type=int, help='ホストごとの同時リクエスト数')
+def verify(input_file, update_cache, report, concurrency, per_host):
     """文献の実在性検証"""
     console.print(f"📖 文献を読み込み中: {input_file}", style="cyan")
     
@@ -57,15 +162,25 @@ def verify(input_file, update_cache, report):
         console.print("\n🔍 実在性検証を実行中...", style="cyan")
         
         async def run_verification():
-            results = {}
-            async with Verifier() as verifier:
-                for item in track(unique_items, description="検証中..."):
-                    item_results = await verify_work(item.to_dict(), verifier)
-                    results[item.id] = {
-                        'item': item,
-                        'results': item_results
-                    }
-            return results
+            items_by_id = {item.id: item for item in unique_items}
+            completed = {}
+            try:
+                with verification_progress() as progress:
+                    task = progress.add_task("検証中...", total=len(unique_items))
+                    works = (item.to_dict() for item in unique_items)
+                    async for work, item_results in verify_many(
+                        works, concurrency=concurrency, per_host_limit=per_host
+                    ):
+                        completed[work['id']] = item_results
+                        progress.advance(task)
+            finally:
+                await close_http_client()
+            
+            # 表・レポートは入力順に並べる
+            return {
+                item_id: {'item': items_by_id[item_id], 'results': completed[item_id]}
+                for item_id in items_by_id
+            }
         
         all_results = asyncio.run(run_verification())
         
@@ -94,12 +209,13 @@ def verify(input_file, update_cache, report):
             )
         
         console.print(table)
+        print_cache_stats()
         
         # レポート出力
         if report:
             with open(report, 'w', encoding='utf-8') as f:
                 f.write("# 実在性検証レポート\n\n")
-                f.write(f"検証日時: {asyncio.get_event_loop().time()}\n\n")
+                f.write(f"検証日時: {datetime.now().isoformat(timespec='seconds')}\n\n")
                 
                 for work_id, data in all_results.items():
                     item = data['item']
@@ -125,6 +241,64 @@ def verify(input_file, update_cache, report):
         raise
 
 
+@cli.command()
+@click.option('--chunk-size', default=DEFAULT_STREAM_CHUNK_SIZE, type=int, help='1回に読み出す件数')
+@click.option('--report', type=click.Path(), help='検証レポートの出力先')
+@click.option('--concurrency', default=DEFAULT_BULK_CONCURRENCY, type=int, help='同時に検証する文献数')
+@click.option('--per-host', default=DEFAULT_PER_HOST_CONCURRENCY, type=int, help='ホストごとの同時リクエスト数')
+def reverify(chunk_size, report, concurrency, per_host):
+    """登録済みの全文献を再検証して結果を保存"""
+    async def run_reverification():
+        total = await WorkDAO.count()
+        writer = CheckWriter()
+        report_file = open(report, 'w', encoding='utf-8') if report else None
+        counts = {'ok': 0, 'warn': 0, 'fail': 0}
+        
+        try:
+            if report_file:
+                report_file.write("# 再検証レポート\n\n")
+            
+            with verification_progress() as progress:
+                task = progress.add_task("検証中...", total=total)
+                # 文献は必要な分だけ読み出し、結果はまとめて書き込む（件数によらずメモリ一定）
+                works = (item.to_dict() async for item in WorkDAO.iter_items(chunk_size=chunk_size))
+                async for work, results in verify_many(
+                    works, concurrency=concurrency, per_host_limit=per_host
+                ):
+                    await writer.add(check_rows(work['id'], results))
+                    for result in results.values():
+                        counts[result.status] = counts.get(result.status, 0) + 1
+                    
+                    if report_file:
+                        report_file.write(f"## {work.get('title')}\n\n- **ID**: {work['id']}\n\n")
+                        for kind, result in results.items():
+                            report_file.write(f"- **{kind}**: {result.status} - {result.detail}\n")
+                        report_file.write("\n---\n\n")
+                    
+                    progress.advance(task)
+        finally:
+            await writer.close()
+            await close_http_client()
+            if report_file:
+                report_file.close()
+        
+        return total, counts
+    
+    try:
+        total, counts = run_with_pool(run_reverification())
+        console.print(
+            f"✅ {total}件を再検証しました（ok: {counts['ok']}, warn: {counts['warn']}, fail: {counts['fail']}）",
+            style="green"
+        )
+        print_cache_stats()
+        if report:
+            console.print(f"✅ レポートを出力しました: {report}", style="green")
+    
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
 @cli.command()
 @click.option('--style', type=click.Choice(['apa', 'ieee']), default='apa', help='引用スタイル')
 @click.option('--in', 'input_file', required=True, type=click.Path(exists=True), help='入力CSL-JSONファイル')
@@ -186,7 +360,7 @@ def claim(work_id, claim, page, evidence, limitations):
                 verified=card.verified
             )
         
-        card_id = asyncio.run(save_card())
+        card_id = run_with_pool(save_card())
         
         console.print(f"✅ カードを作成しました: {card_id}", style="green")
         console.print(f"完成度: {'✅ 完成' if card.is_complete() else '⚠️ 未完成'}", 
@@ -197,6 +371,32 @@ def claim(work_id, claim, page, evidence, limitations):
         raise
 
 
+@cli.command()
+@click.option('--style', type=click.Choice(['apa', 'ieee']), default='apa', help='引用スタイル')
+@click.option('--out', 'output_file', required=True, type=click.Path(), help='出力先ファイル')
+@click.option('--format', 'output_format', type=click.Choice(['text', 'bibtex']), default='text', help='出力形式')
+def export(style, output_file, output_format):
+    """登録済みの全文献の参考文献リストを出力"""
+    async def run_export():
+        # APA は SQLite 側で並べ替え、1件ずつ整形して書き出す（件数によらずメモリ一定）
+        order = 'apa' if output_format == 'text' and style == 'apa' else 'created'
+        count = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            async for entry in iter_bibliography(WorkDAO.iter_items(order=order), style, output_format):
+                f.write(entry)
+                count += 1
+        return count
+    
+    try:
+        count = run_with_pool(run_export())
+        console.print(f"✅ {count}件の参考文献リストを出力しました: {output_file}", style="green")
+        console.print(f"スタイル: {style.upper()}, 形式: {output_format}", style="blue")
+    
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
 @cli.command()
 @click.option('--work-id', required=True, help='文献ID')
 @click.option('--out', 'output_file', required=True, type=click.Path(), help='出力先ファイル')
@@ -213,7 +413,7 @@ def report(work_id, output_file):
             
             return work, checks, cards
         
-        work, checks, cards = asyncio.run(generate_report())
+        work, checks, cards = run_with_pool(generate_report())
         
         # Markdownレポート生成
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -259,6 +459,98 @@ def report(work_id, output_file):
         raise
 
 
+@cli.command()
+@click.argument('query')
+@click.option('--limit', default=20, type=int, help='最大件数')
+def search(query, limit):
+    """登録済み文献を全文検索"""
+    try:
+        hits = run_with_pool(SearchDAO.search(query, limit=limit))
+        
+        if not hits:
+            console.print("該当する文献はありません（3文字以上の語で検索してください）", style="yellow")
+            return
+        
+        table = Table(title=f"検索結果: {query}")
+        table.add_column("文献ID", style="cyan")
+        table.add_column("タイトル", style="white")
+        table.add_column("年", style="blue")
+        table.add_column("一致箇所", style="green")
+        
+        for hit in hits:
+            table.add_row(
+                hit['id'][:12],
+                hit['title'][:50] if hit['title'] else "-",
+                str(hit['issued_year'] or "-"),
+                hit['snippet'] or ""
+            )
+        
+        console.print(table)
+    
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
+@cli.group()
+def cache():
+    """検証キャッシュの管理"""
+    pass
+
+
+@cache.command(name='migrate')
+@click.option('--from-dir', 'cache_dir', type=click.Path(exists=True, file_okay=False),
+              default=str(Path.home() / ".refsys" / "cache"), help='旧JSONキャッシュのディレクトリ')
+@click.option('--remove-files', is_flag=True, help='取り込んだJSONファイルを削除')
+def cache_migrate(cache_dir, remove_files):
+    """旧JSONファイルキャッシュをSQLiteに移行"""
+    try:
+        store = SQLiteCacheManager()
+        try:
+            imported = store.import_json_dir(Path(cache_dir), remove_files=remove_files)
+        finally:
+            store.close()
+        console.print(f"✅ {imported}件のキャッシュを移行しました", style="green")
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
+@cache.command(name='purge')
+@click.option('--all', 'include_all', is_flag=True,
+              help='期限切れ直後のものや検証子（ETag など）のあるものも含めて削除')
+def cache_purge(include_all):
+    """有効期限切れのキャッシュを削除"""
+    try:
+        store = SQLiteCacheManager()
+        try:
+            removed = store.purge_expired(include_all=include_all)
+        finally:
+            store.close()
+        console.print(f"✅ {removed}件の期限切れキャッシュを削除しました", style="green")
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
+@cli.group()
+def checks():
+    """検証履歴の管理"""
+    pass
+
+
+@checks.command(name='compact')
+@click.option('--older-than', 'older_than_days', default=30, type=int, help='この日数より古い履歴だけをまとめる')
+def checks_compact(older_than_days):
+    """検証履歴の連続した同一ステータスの行をまとめる"""
+    try:
+        removed = run_with_pool(CheckDAO.compact_history(older_than_days))
+        console.print(f"✅ {removed}件の重複した履歴を削除しました", style="green")
+    except Exception as e:
+        console.print(f"❌ エラー: {e}", style="red")
+        raise
+
+
 @cli.command()
 @click.option('--host', default='0.0.0.0', help='バインドするホスト')
 @click.option('--port', default=8000, type=int, help='バインドするポート')
@@ -3,12 +3,31 @@
 """
 import sqlite3
 import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, AsyncIterator, Awaitable, Callable, Deque, List, Sequence, Tuple, TypeVar
 import asyncio
 import aiosqlite
 
 DEFAULT_DB_PATH = Path.home() / ".refsys" / "refsys.db"
+DEFAULT_POOL_SIZE = 5
+DEFAULT_WRITE_BATCH_SIZE = 100
+
+# ストレージモード: "default"（ロールバックジャーナル）または "wal"
+DB_MODE_DEFAULT = "default"
+DB_MODE_WAL = "wal"
+
+# WALモードで全接続に適用するPRAGMA
+WAL_PRAGMAS = [
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA mmap_size = 268435456;",  # 256MB
+    "PRAGMA cache_size = -65536;",  # 64MB
+    "PRAGMA busy_timeout = 5000;",
+]
+
+T = TypeVar("T")
 
 
 def get_db_path() -> Path:
@@ -19,6 +38,22 @@ def get_db_path() -> Path:
     return DEFAULT_DB_PATH
 
 
+def get_cache_db_path() -> Path:
+    """検証キャッシュ用データベースのパスを取得（既定: 本体DBと同じディレクトリの cache.db）"""
+    cache_db_path = os.environ.get("REFSYS_CACHE_DB_PATH")
+    if cache_db_path:
+        return Path(cache_db_path)
+    return get_db_path().with_name("cache.db")
+
+
+def get_db_mode() -> str:
+    """ストレージモードを取得（REFSYS_DB_MODE）"""
+    mode = os.environ.get("REFSYS_DB_MODE", DB_MODE_DEFAULT).lower()
+    if mode not in (DB_MODE_DEFAULT, DB_MODE_WAL):
+        raise ValueError(f"Unknown REFSYS_DB_MODE: {mode}")
+    return mode
+
+
 def ensure_db_dir():
     """データベースディレクトリの作成"""
     db_path = get_db_path()
@@ -45,12 +80,327 @@ async def get_async_connection() -> aiosqlite.Connection:
     return conn
 
 
+class ConnectionPool:
+    """aiosqlite接続プール
+
+    接続（とそのスレッド）を使い回し、同時に開く接続数を max_size に制限する。
+    """
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_size: int = DEFAULT_POOL_SIZE,
+        health_check_interval: float = 30.0,
+        read_only: bool = False,
+        pragmas: Sequence[str] = ()
+    ):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.read_only = read_only
+        self.pragmas = list(pragmas)
+        self._idle: Deque[Tuple[aiosqlite.Connection, float]] = deque()
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._size = 0
+        self._closed = False
+    
+    @property
+    def size(self) -> int:
+        """開いている接続数"""
+        return self._size
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """新しい接続を作成"""
+        db_path = self.db_path or ensure_db_dir()
+        if self.read_only:
+            conn = await aiosqlite.connect(f"file:{db_path}?mode=ro", uri=True)
+        else:
+            conn = await aiosqlite.connect(str(db_path))
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA foreign_keys = ON;")
+        for pragma in self.pragmas:
+            await conn.execute(pragma)
+        self._size += 1
+        return conn
+    
+    async def _discard(self, conn: aiosqlite.Connection):
+        """接続を破棄"""
+        self._size -= 1
+        try:
+            await conn.close()
+        except Exception:
+            pass
+    
+    async def _is_healthy(self, conn: aiosqlite.Connection) -> bool:
+        """ヘルスチェック"""
+        try:
+            cursor = await conn.execute("SELECT 1")
+            await cursor.fetchone()
+            return True
+        except Exception:
+            return False
+    
+    async def _get(self) -> aiosqlite.Connection:
+        """アイドル接続を取り出す（なければ作成）"""
+        while self._idle:
+            conn, released_at = self._idle.pop()
+            if time.monotonic() - released_at < self.health_check_interval:
+                return conn
+            if await self._is_healthy(conn):
+                return conn
+            await self._discard(conn)
+        return await self._connect()
+    
+    async def _put(self, conn: aiosqlite.Connection):
+        """接続をプールに返却"""
+        try:
+            # 未コミットのトランザクションは次の利用者に持ち越さない
+            if conn.in_transaction:
+                await conn.rollback()
+        except Exception:
+            await self._discard(conn)
+            return
+        
+        if self._closed:
+            await self._discard(conn)
+        else:
+            self._idle.append((conn, time.monotonic()))
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """接続を借りる（async with で使用）"""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        
+        await self._semaphore.acquire()
+        try:
+            conn = await self._get()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        
+        try:
+            yield conn
+        finally:
+            await self._put(conn)
+            self._semaphore.release()
+    
+    async def close(self):
+        """すべてのアイドル接続を閉じる"""
+        self._closed = True
+        while self._idle:
+            conn, _ = self._idle.pop()
+            await self._discard(conn)
+
+
+class WriteQueue:
+    """単一ライター: すべての書き込みを1本の接続・1つのタスクで直列化する
+
+    キューに溜まったジョブはまとめて1トランザクションでコミットする。
+    各ジョブは SAVEPOINT で囲むため、失敗したジョブだけが巻き戻される。
+    """
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_batch: int = DEFAULT_WRITE_BATCH_SIZE,
+        pragmas: Sequence[str] = ()
+    ):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.pragmas = list(pragmas)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._closed = False
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """ライター接続を作成"""
+        db_path = self.db_path or ensure_db_dir()
+        conn = await aiosqlite.connect(str(db_path))
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA journal_mode = WAL;")
+        await conn.execute("PRAGMA foreign_keys = ON;")
+        for pragma in self.pragmas:
+            await conn.execute(pragma)
+        return conn
+    
+    def _ensure_started(self):
+        """ライタータスクを起動（初回、またはエラーで止まっていたら再起動）"""
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+    
+    async def submit(self, fn: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+        """書き込みジョブを投入し、コミット後の結果を待つ
+
+        fn は接続を受け取って文を実行する。コミットはライターが行うので fn 内では呼ばない。
+        """
+        if self._closed:
+            raise RuntimeError("Write queue is closed")
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, future))
+        return await future
+    
+    async def _run(self):
+        """ライターループ（接続やループが失敗したら、待っているジョブすべてにその例外を返して止まる）"""
+        batch: List[Tuple[Callable, asyncio.Future]] = []
+        try:
+            if self._conn is None:
+                self._conn = await self._connect()
+            stopping = False
+            while not stopping:
+                job = await self._queue.get()
+                if job is None:
+                    break
+                
+                # 待機中のジョブをまとめて取り出す
+                batch = [job]
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    job = self._queue.get_nowait()
+                    if job is None:
+                        stopping = True
+                        break
+                    batch.append(job)
+                
+                await self._commit_batch(batch)
+                batch = []
+        except Exception as e:
+            print(f"Write queue stopped: {e}")
+            if self._conn is not None:
+                try:
+                    await self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+            # 次の submit でライターを起動し直す
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+                if job is not None and not job[1].done():
+                    job[1].set_exception(e)
+    
+    async def _commit_batch(self, batch: List[Tuple[Callable, asyncio.Future]]):
+        """ジョブ群を1トランザクションで実行"""
+        conn = self._conn
+        outcomes = []
+        try:
+            await conn.execute("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                await conn.execute("SAVEPOINT job")
+                try:
+                    result = await fn(conn)
+                    await conn.execute("RELEASE job")
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    await conn.execute("ROLLBACK TO job")
+                    await conn.execute("RELEASE job")
+                    outcomes.append((future, None, e))
+            await conn.commit()
+        except Exception as e:
+            try:
+                await conn.rollback()
+            except Exception:
+                pass
+            outcomes = [(future, None, e) for _, future in batch]
+        
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    async def close(self):
+        """残りのジョブを処理してから停止"""
+        self._closed = True
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+_pool: Optional[ConnectionPool] = None
+_writer: Optional[WriteQueue] = None
+
+
+def get_pool() -> ConnectionPool:
+    """プロセス共有の接続プールを取得（未作成なら作成）
+
+    WALモードでは読み取り専用接続のプールになる（書き込みは run_write 経由）。
+    """
+    global _pool
+    if _pool is None:
+        max_size = int(os.environ.get("REFSYS_DB_POOL_SIZE", DEFAULT_POOL_SIZE))
+        if get_db_mode() == DB_MODE_WAL:
+            _pool = ConnectionPool(max_size=max_size, read_only=True, pragmas=WAL_PRAGMAS)
+        else:
+            _pool = ConnectionPool(max_size=max_size)
+    return _pool
+
+
+def get_writer() -> WriteQueue:
+    """WALモードの共有ライターを取得（未作成なら作成）"""
+    global _writer
+    if _writer is None:
+        _writer = WriteQueue(pragmas=WAL_PRAGMAS)
+    return _writer
+
+
+async def run_write(fn: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+    """書き込みを実行してコミット
+
+    WALモードでは単一ライターのキューに投入し、他の書き込みとまとめてコミットする。
+    デフォルトモードではプールの接続で実行して即コミットする。
+    """
+    if get_db_mode() == DB_MODE_WAL:
+        return await get_writer().submit(fn)
+    
+    async with get_pool().acquire() as conn:
+        result = await fn(conn)
+        await conn.commit()
+        return result
+
+
+async def close_pool():
+    """共有プールとライターを閉じる（アプリ終了時に呼ぶ）"""
+    global _pool, _writer
+    if _writer is not None:
+        writer, _writer = _writer, None
+        await writer.close()
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def run_with_pool(coro):
+    """コルーチンを実行し、終了時に共有プールを閉じる（CLI・スクリプト用）"""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_pool()
+    
+    return asyncio.run(runner())
+
+
 def init_database():
     """データベースの初期化"""
-    from .schema import ALL_TABLES, CREATE_INDEXES
+    from .dao import author_cache
+    from .schema import ALL_TABLES, CREATE_INDEXES, CREATE_TRIGGERS, BACKFILL_WORKS_FTS_IDS, BACKFILL_WORKS_FTS
+    from .migrations import apply_migrations
     
     conn = get_connection()
     try:
+        if get_db_mode() == DB_MODE_WAL:
+            conn.execute("PRAGMA journal_mode = WAL;")
+        
         # テーブル作成
         for table_sql in ALL_TABLES:
             conn.execute(table_sql)
@@ -60,6 +410,21 @@ def init_database():
             conn.execute(index_sql)
         
         conn.commit()
+        
+        # スキーママイグレーション（検索インデックスの作り直しを含むので先に行う）
+        applied = apply_migrations(conn)
+        if applied:
+            print(f"✅ Applied migrations: {applied}")
+        
+        # 検索インデックスのトリガー作成と既存データの取り込み
+        for trigger_sql in CREATE_TRIGGERS:
+            conn.execute(trigger_sql)
+        conn.execute(BACKFILL_WORKS_FTS_IDS)
+        conn.execute(BACKFILL_WORKS_FTS)
+        conn.commit()
+        
+        # 作り直したDBでは以前の著者IDは使えない
+        author_cache.clear()
         print(f"✅ Database initialized at: {get_db_path()}")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
@@ -70,10 +435,15 @@ def init_database():
 
 async def init_database_async():
     """データベースの初期化（非同期版）"""
-    from .schema import ALL_TABLES, CREATE_INDEXES
+    from .dao import author_cache
+    from .schema import ALL_TABLES, CREATE_INDEXES, CREATE_TRIGGERS, BACKFILL_WORKS_FTS_IDS, BACKFILL_WORKS_FTS
+    from .migrations import apply_migrations_async
     
     conn = await get_async_connection()
     try:
+        if get_db_mode() == DB_MODE_WAL:
+            await conn.execute("PRAGMA journal_mode = WAL;")
+        
         # テーブル作成
         for table_sql in ALL_TABLES:
             await conn.execute(table_sql)
@@ -83,6 +453,21 @@ async def init_database_async():
             await conn.execute(index_sql)
         
         await conn.commit()
+        
+        # スキーママイグレーション（検索インデックスの作り直しを含むので先に行う）
+        applied = await apply_migrations_async(conn)
+        if applied:
+            print(f"✅ Applied migrations: {applied}")
+        
+        # 検索インデックスのトリガー作成と既存データの取り込み
+        for trigger_sql in CREATE_TRIGGERS:
+            await conn.execute(trigger_sql)
+        await conn.execute(BACKFILL_WORKS_FTS_IDS)
+        await conn.execute(BACKFILL_WORKS_FTS)
+        await conn.commit()
+        
+        # 作り直したDBでは以前の著者IDは使えない
+        author_cache.clear()
         print(f"✅ Database initialized at: {get_db_path()}")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
@@ -1,89 +1,476 @@
 """
 データアクセスオブジェクト: 文献データのCRUD操作
 """
+import asyncio
+import base64
+import hashlib
 import json
-from typing import List, Dict, Any, Optional
+import sqlite3
+from collections import OrderedDict
+from typing import List, Dict, Any, AsyncIterator, Iterable, Optional, Set, Tuple
 from datetime import datetime
 import aiosqlite
-from refsys.db import get_async_connection
+from refsys.db import get_db_path, get_pool, run_write
 from refsys.models import CSLItem
 
 
+# 一括インポート時の1トランザクションあたりの件数
+DEFAULT_IMPORT_CHUNK_SIZE = 500
+
+# ストリーミング取得時に1回で読み出す件数
+DEFAULT_STREAM_CHUNK_SIZE = 500
+
+# iter_items(order='apa') の並び順（第一著者の姓、発行年）。並べ替えは SQLite 側で
+# idx_works_apa（同じ式のインデックス）を使って行い、このキーでキーセットページングする
+APA_FAMILY_KEY = "lower(coalesce(json_extract(raw_csl_json, '$.author[0].family'), ''))"
+APA_SORT_KEY = f"{APA_FAMILY_KEY}, coalesce(issued_year, 9999), id"
+
+# 検証結果バッファのフラッシュ条件（件数 / 秒）
+CHECK_FLUSH_ROWS = 500
+CHECK_FLUSH_SECONDS = 1.0
+# 書き込みに失敗したバッファを書き直す回数（database is locked などの一時的なエラー向け）
+CHECK_FLUSH_RETRIES = 3
+
+# 著者IDキャッシュの最大件数
+AUTHOR_CACHE_SIZE = 100_000
+
+# 一覧表示で返すカラム（work_summary から1行で取得）
+SUMMARY_COLUMNS = """
+    s.work_id AS id, s.title, s.type, s.issued_year, s.doi, s.peer_reviewed,
+    s.retracted, s.consensus_score, s.created_at, s.authors_json,
+    s.check_status, s.last_checked_at, s.card_count, s.evidence_count
+"""
+
+INSERT_WORK_SQL = """
+INSERT INTO works (
+    id, title, type, container_title, issued_year,
+    doi, url, arxiv_id, pubmed_id, isbn,
+    peer_reviewed, retracted, consensus_score, raw_csl_json, content_hash
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 内容ハッシュが変わった文献だけを更新する（分析結果は新しい値がなければ保持、撤回は一度付いたら外さない）
+UPSERT_WORK_SQL = INSERT_WORK_SQL + """
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    type = excluded.type,
+    container_title = excluded.container_title,
+    issued_year = excluded.issued_year,
+    doi = excluded.doi,
+    url = excluded.url,
+    arxiv_id = excluded.arxiv_id,
+    pubmed_id = excluded.pubmed_id,
+    isbn = excluded.isbn,
+    peer_reviewed = coalesce(excluded.peer_reviewed, works.peer_reviewed),
+    retracted = max(coalesce(excluded.retracted, 0), coalesce(works.retracted, 0)),
+    consensus_score = coalesce(excluded.consensus_score, works.consensus_score),
+    raw_csl_json = excluded.raw_csl_json,
+    content_hash = excluded.content_hash,
+    updated_at = CURRENT_TIMESTAMP
+WHERE works.content_hash IS NOT excluded.content_hash
+"""
+
+# 内容ハッシュに含めない項目（インポート後の分析で付与される値）
+HASH_EXCLUDED_FIELDS = ('peer_reviewed', 'consensus_score', 'retracted')
+
+
+def content_hash(csl: CSLItem) -> str:
+    """正規化した CSL-JSON の SHA-256
+
+    キー順・空白・未設定項目の違いでは変わらない。分析で付与される値は含めない。
+    """
+    data = {
+        key: value for key, value in csl.to_dict().items()
+        if key not in HASH_EXCLUDED_FIELDS
+    }
+    normalized = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def encode_cursor(created_at: str, work_id: str) -> str:
+    """ページングカーソルを作成（(created_at, id) を不透明な文字列に）"""
+    raw = json.dumps([created_at, work_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """ページングカーソルを復元"""
+    try:
+        created_at, work_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, work_id
+
+
+AuthorKey = Tuple[Optional[str], Optional[str]]
+
+
+class AuthorCache:
+    """著者名 (family, given) -> author_id のLRUキャッシュ（プロセス内）
+    
+    author_id はDBごとの値なので、DBのパスが変わったら空にする（作り直したときは clear を呼ぶ）。
+    """
+    def __init__(self, max_size: int = AUTHOR_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[AuthorKey, int]" = OrderedDict()
+        self._db_path = None
+    
+    def _check_db(self):
+        """別のDBに切り替わっていれば空にする"""
+        db_path = get_db_path()
+        if db_path != self._db_path:
+            self._entries.clear()
+            self._db_path = db_path
+    
+    def get(self, name: AuthorKey) -> Optional[int]:
+        """キャッシュから取得"""
+        self._check_db()
+        author_id = self._entries.get(name)
+        if author_id is not None:
+            self._entries.move_to_end(name)
+        return author_id
+    
+    def put_many(self, entries: Dict[AuthorKey, int]):
+        """まとめて登録（古いものから追い出す）"""
+        self._check_db()
+        for name, author_id in entries.items():
+            self._entries[name] = author_id
+            self._entries.move_to_end(name)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """キャッシュを空にする"""
+        self._entries.clear()
+
+
+author_cache = AuthorCache()
+
+
 class WorkDAO:
     """文献データアクセス"""
     
+    @staticmethod
+    def _work_row(csl: CSLItem) -> Tuple:
+        """works テーブルへの挿入値"""
+        year = csl.issued.get_year() if csl.issued else None
+        return (
+            csl.id, csl.title, csl.type, csl.container_title, year,
+            csl.DOI, csl.URL, csl.arxiv_id, csl.pubmed_id, csl.ISBN,
+            csl.peer_reviewed, csl.retracted, csl.consensus_score,
+            json.dumps(csl.to_dict()), content_hash(csl)
+        )
+    
     @staticmethod
     async def create(csl: CSLItem) -> str:
         """文献を作成"""
-        conn = await get_async_connection()
-        try:
+        async def insert(conn: aiosqlite.Connection) -> str:
             # 文献レコード挿入
-            year = csl.issued.get_year() if csl.issued else None
+            await conn.execute(INSERT_WORK_SQL, WorkDAO._work_row(csl))
             
-            await conn.execute(
-                """
-                INSERT INTO works (
-                    id, title, type, container_title, issued_year,
-                    doi, url, arxiv_id, pubmed_id, isbn,
-                    peer_reviewed, retracted, consensus_score, raw_csl_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    csl.id, csl.title, csl.type, csl.container_title, year,
-                    csl.DOI, csl.URL, csl.arxiv_id, csl.pubmed_id, csl.ISBN,
-                    csl.peer_reviewed, csl.retracted, csl.consensus_score,
-                    json.dumps(csl.to_dict())
+            # 著者の挿入（著者数によらず一定の文数）
+            if csl.author:
+                names = [(author.family, author.given) for author in csl.author]
+                author_ids = await WorkDAO._resolve_authors(conn, names, resolved)
+                await conn.executemany(
+                    "INSERT OR IGNORE INTO work_authors (work_id, author_id, ord) VALUES (?, ?, ?)",
+                    [(csl.id, author_ids[name], ord_num) for ord_num, name in enumerate(names)]
                 )
+            
+            return csl.id
+        
+        resolved: Dict[AuthorKey, int] = {}
+        work_id = await run_write(insert)
+        author_cache.put_many(resolved)
+        return work_id
+    
+    @staticmethod
+    async def create_many(
+        items: Iterable[CSLItem],
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+    ) -> List[Dict[str, Any]]:
+        """文献を一括作成
+
+        chunk_size 件ごとに1トランザクションで works / authors / work_authors を
+        executemany で書き込む。戻り値は入力順の結果リスト:
+        {'id': ..., 'status': 'created' | 'exists' | 'error', 'error': ...}
+        """
+        outcomes: List[Dict[str, Any]] = []
+        chunk: List[CSLItem] = []
+        
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                outcomes.extend(await WorkDAO._create_chunk(chunk))
+                chunk = []
+        if chunk:
+            outcomes.extend(await WorkDAO._create_chunk(chunk))
+        
+        return outcomes
+    
+    @staticmethod
+    async def _create_chunk(chunk: List[CSLItem]) -> List[Dict[str, Any]]:
+        """1チャンク分を1トランザクションで作成"""
+        async def insert(conn: aiosqlite.Connection) -> List[Dict[str, Any]]:
+            # 既存のID・DOIを一括で確認
+            ids = [item.id for item in chunk]
+            dois = [item.DOI for item in chunk if item.DOI]
+            cursor = await conn.execute(
+                f"""
+                SELECT id, doi FROM works
+                WHERE id IN ({','.join('?' * len(ids))})
+                   OR doi IN ({','.join('?' * len(dois)) or 'NULL'})
+                """,
+                ids + dois
             )
+            seen_ids = set()
+            seen_dois = set()
+            for row in await cursor.fetchall():
+                seen_ids.add(row[0])
+                if row[1]:
+                    seen_dois.add(row[1])
             
-            # 著者の挿入
-            if csl.author:
-                for ord_num, author in enumerate(csl.author):
-                    author_id = await WorkDAO._get_or_create_author(
-                        conn,
-                        author.family,
-                        author.given
-                    )
-                    await conn.execute(
-                        "INSERT INTO work_authors (work_id, author_id, ord) VALUES (?, ?, ?)",
-                        (csl.id, author_id, ord_num)
-                    )
+            results = []
+            new_items = []
+            for item in chunk:
+                if item.id in seen_ids or (item.DOI and item.DOI in seen_dois):
+                    results.append({'id': item.id, 'status': 'exists', 'error': None})
+                    continue
+                seen_ids.add(item.id)
+                if item.DOI:
+                    seen_dois.add(item.DOI)
+                new_items.append(item)
+                results.append({'id': item.id, 'status': 'created', 'error': None})
             
-            await conn.commit()
-            return csl.id
+            await conn.executemany(
+                INSERT_WORK_SQL,
+                [WorkDAO._work_row(item) for item in new_items]
+            )
+            
+            # 著者はチャンク全体でまとめて解決する
+            names = [
+                (author.family, author.given)
+                for item in new_items
+                for author in item.author or []
+            ]
+            author_ids = await WorkDAO._resolve_authors(conn, names, resolved)
+            links = [
+                (item.id, author_ids[(author.family, author.given)], ord_num)
+                for item in new_items
+                for ord_num, author in enumerate(item.author or [])
+            ]
+            
+            await conn.executemany(
+                "INSERT OR IGNORE INTO work_authors (work_id, author_id, ord) VALUES (?, ?, ?)",
+                links
+            )
+            return results
+        
+        resolved: Dict[AuthorKey, int] = {}
+        try:
+            results = await run_write(insert)
+            author_cache.put_many(resolved)
+            return results
+        except Exception as e:
+            if len(chunk) == 1:
+                return [{'id': chunk[0].id, 'status': 'error', 'error': str(e)}]
+            # チャンク全体が失敗した場合は1件ずつ処理して失敗項目を特定する（既存の判定はそのまま）
+            results = []
+            for item in chunk:
+                results.extend(await WorkDAO._create_chunk([item]))
+            return results
+    
+    @staticmethod
+    async def upsert_many(
+        items: Iterable[CSLItem],
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+    ) -> List[Dict[str, Any]]:
+        """文献を一括で作成または更新（再インポート用）
+
+        保存済みの内容ハッシュと同じ文献は書き込まずにスキップし、変わった文献だけを
+        ON CONFLICT DO UPDATE で更新する（著者の紐付けも作り直す）。戻り値は入力順の結果リスト:
+        {'id': ..., 'status': 'created' | 'updated' | 'unchanged' | 'exists' | 'error', 'error': ...}
+        'exists' は同じDOIが別IDの文献として登録済みの場合。
+        """
+        outcomes: List[Dict[str, Any]] = []
+        chunk: List[CSLItem] = []
         
-        finally:
-            await conn.close()
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                outcomes.extend(await WorkDAO._upsert_chunk(chunk))
+                chunk = []
+        if chunk:
+            outcomes.extend(await WorkDAO._upsert_chunk(chunk))
+        
+        return outcomes
+    
+    @staticmethod
+    async def unchanged_ids(items: List[CSLItem]) -> Set[str]:
+        """保存済みの内容ハッシュと一致する文献IDの集合（読み取りのみ）"""
+        stored = await WorkDAO._stored_hashes([item.id for item in items])
+        return {
+            item.id for item in items
+            if stored.get(item.id, (None, None))[1] == content_hash(item)
+        }
+    
+    @staticmethod
+    async def _stored_hashes(work_ids: List[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """文献IDごとの (DOI, 内容ハッシュ) を取得"""
+        stored: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        async with get_pool().acquire() as conn:
+            for start in range(0, len(work_ids), DEFAULT_IMPORT_CHUNK_SIZE):
+                batch = work_ids[start:start + DEFAULT_IMPORT_CHUNK_SIZE]
+                cursor = await conn.execute(
+                    f"SELECT id, doi, content_hash FROM works WHERE id IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for work_id, doi, digest in await cursor.fetchall():
+                    stored[work_id] = (doi, digest)
+        return stored
     
     @staticmethod
-    async def _get_or_create_author(
+    async def _upsert_chunk(chunk: List[CSLItem]) -> List[Dict[str, Any]]:
+        """1チャンク分を作成・更新（未変更のみのチャンクは書き込みなし）"""
+        hashes = {item.id: content_hash(item) for item in chunk}
+        stored = await WorkDAO._stored_hashes(list(hashes))
+        
+        # 別IDで登録済みのDOIを確認
+        dois = [
+            item.DOI for item in chunk
+            if item.DOI and stored.get(item.id, (None, None))[0] != item.DOI
+        ]
+        doi_owners: Dict[str, str] = {}
+        if dois:
+            async with get_pool().acquire() as conn:
+                cursor = await conn.execute(
+                    f"SELECT doi, id FROM works WHERE doi IN ({','.join('?' * len(dois))})",
+                    dois
+                )
+                doi_owners = {doi: work_id for doi, work_id in await cursor.fetchall()}
+        
+        results = []
+        pending: List[CSLItem] = []
+        updated_ids: List[str] = []
+        for item in chunk:
+            if item.id in stored and stored[item.id][1] == hashes[item.id]:
+                results.append({'id': item.id, 'status': 'unchanged', 'error': None})
+                continue
+            if item.DOI and doi_owners.setdefault(item.DOI, item.id) != item.id:
+                results.append({'id': item.id, 'status': 'exists', 'error': None})
+                continue
+            if item.id in stored:
+                updated_ids.append(item.id)
+                results.append({'id': item.id, 'status': 'updated', 'error': None})
+            else:
+                results.append({'id': item.id, 'status': 'created', 'error': None})
+            pending.append(item)
+        
+        if not pending:
+            return results
+        
+        async def upsert(conn: aiosqlite.Connection):
+            await conn.executemany(
+                UPSERT_WORK_SQL,
+                [WorkDAO._work_row(item) for item in pending]
+            )
+            
+            # 更新した文献は著者の紐付けを作り直す
+            if updated_ids:
+                await conn.execute(
+                    f"DELETE FROM work_authors WHERE work_id IN ({','.join('?' * len(updated_ids))})",
+                    updated_ids
+                )
+            names = [
+                (author.family, author.given)
+                for item in pending
+                for author in item.author or []
+            ]
+            author_ids = await WorkDAO._resolve_authors(conn, names, resolved)
+            await conn.executemany(
+                "INSERT OR IGNORE INTO work_authors (work_id, author_id, ord) VALUES (?, ?, ?)",
+                [
+                    (item.id, author_ids[(author.family, author.given)], ord_num)
+                    for item in pending
+                    for ord_num, author in enumerate(item.author or [])
+                ]
+            )
+        
+        resolved: Dict[AuthorKey, int] = {}
+        try:
+            await run_write(upsert)
+            author_cache.put_many(resolved)
+            return results
+        except Exception as e:
+            if len(chunk) == 1:
+                return [{'id': chunk[0].id, 'status': 'error', 'error': str(e)}]
+            # チャンク全体が失敗した場合は1件ずつ処理して失敗項目を特定する
+            results = []
+            for item in chunk:
+                results.extend(await WorkDAO._upsert_chunk([item]))
+            return results
+    
+    @staticmethod
+    async def _resolve_authors(
         conn: aiosqlite.Connection,
-        family: Optional[str],
-        given: Optional[str]
-    ) -> int:
-        """著者を取得または作成"""
-        # 既存チェック
-        cursor = await conn.execute(
-            "SELECT id FROM authors WHERE family = ? AND given = ?",
-            (family, given)
-        )
-        row = await cursor.fetchone()
+        names: List[AuthorKey],
+        resolved: Dict[AuthorKey, int]
+    ) -> Dict[AuthorKey, int]:
+        """著者名 (family, given) のリストを著者IDに解決（なければ作成）
+
+        キャッシュにない名前だけを、INSERT ... ON CONFLICT DO NOTHING と
+        1回の検索で一括処理する。DBから解決した分は resolved に入れて返すので、
+        呼び出し側はコミット成功後にキャッシュへ登録する。
+        """
+        author_ids: Dict[AuthorKey, int] = {}
+        missing: List[AuthorKey] = []
+        for name in dict.fromkeys(names):
+            author_id = author_cache.get(name)
+            if author_id is None:
+                missing.append(name)
+            else:
+                author_ids[name] = author_id
         
-        if row:
-            return row[0]
+        if not missing:
+            return author_ids
         
-        # 新規作成
+        payload = json.dumps(missing, ensure_ascii=False)
+        # given が NULL の著者は UNIQUE 制約で重複を防げないため NOT EXISTS でも確認する
+        await conn.execute(
+            """
+            INSERT INTO authors (family, given)
+            SELECT json_extract(j.value, '$[0]'), json_extract(j.value, '$[1]')
+            FROM json_each(?) j
+            WHERE NOT EXISTS (
+                SELECT 1 FROM authors a
+                WHERE a.family IS json_extract(j.value, '$[0]')
+                  AND a.given IS json_extract(j.value, '$[1]')
+            )
+            ON CONFLICT DO NOTHING
+            """,
+            (payload,)
+        )
         cursor = await conn.execute(
-            "INSERT INTO authors (family, given) VALUES (?, ?)",
-            (family, given)
+            """
+            SELECT j.key, MIN(a.id)
+            FROM json_each(?) j
+            JOIN authors a
+              ON a.family IS json_extract(j.value, '$[0]')
+             AND a.given IS json_extract(j.value, '$[1]')
+            GROUP BY j.key
+            """,
+            (payload,)
         )
-        return cursor.lastrowid
+        for index, author_id in await cursor.fetchall():
+            author_ids[missing[index]] = author_id
+            resolved[missing[index]] = author_id
+        
+        return author_ids
     
     @staticmethod
     async def get(work_id: str) -> Optional[Dict[str, Any]]:
         """文献を取得"""
-        conn = await get_async_connection()
-        try:
+        async with get_pool().acquire() as conn:
             cursor = await conn.execute(
                 "SELECT * FROM works WHERE id = ?",
                 (work_id,)
@@ -113,100 +500,222 @@ class WorkDAO:
             ]
             
             return work
+    
+    @staticmethod
+    def _summary_row(row: aiosqlite.Row) -> Dict[str, Any]:
+        """work_summary の行を一覧用の辞書に変換"""
+        work = dict(row)
+        work['authors'] = json.loads(work.pop('authors_json'))
+        work['check_status'] = json.loads(work['check_status'])
+        return work
+    
+    @staticmethod
+    async def count() -> int:
+        """登録文献数"""
+        async with get_pool().acquire() as conn:
+            cursor = await conn.execute("SELECT COUNT(*) FROM works")
+            return (await cursor.fetchone())[0]
+    
+    @staticmethod
+    async def iter_items(
+        order: str = 'created',
+        work_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[CSLItem]:
+        """文献を CSLItem として順に返す非同期ジェネレータ
+
+        chunk_size 件ずつ読み出すので、件数によらずメモリ使用量は一定。
+        order='created' は登録の新しい順、order='apa' は APA の参考文献リスト順。
+        どちらも並び順のキーでキーセットページングし、チャンクごとに接続を返すため、
+        反復中に書き込んでもよく（再検証など）、途中で止めても接続を持ち続けない。
+        work_ids を指定した場合はその文献だけを指定順に返す（order は無視）。
+        """
+        remaining = limit
+        
+        def take(rows: List[aiosqlite.Row]) -> List[aiosqlite.Row]:
+            nonlocal remaining
+            if remaining is None:
+                return rows
+            rows = rows[:remaining]
+            remaining -= len(rows)
+            return rows
+        
+        if work_ids is not None:
+            for start in range(0, len(work_ids), chunk_size):
+                async with get_pool().acquire() as conn:
+                    cursor = await conn.execute(
+                        """
+                        SELECT w.raw_csl_json FROM json_each(?) j
+                        JOIN works w ON w.id = j.value
+                        ORDER BY j.key
+                        """,
+                        (json.dumps(work_ids[start:start + chunk_size]),)
+                    )
+                    rows = take(await cursor.fetchall())
+                for row in rows:
+                    yield CSLItem(**json.loads(row[0]))
+                if remaining == 0:
+                    return
+        
+        elif order == 'created':
+            last: Optional[Tuple[str, str]] = None
+            while remaining is None or remaining > 0:
+                where = "WHERE (created_at, id) < (?, ?)" if last else ""
+                async with get_pool().acquire() as conn:
+                    cursor = await conn.execute(
+                        f"""
+                        SELECT created_at, id, raw_csl_json FROM works
+                        {where}
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT ?
+                        """,
+                        (*(last or ()), chunk_size)
+                    )
+                    rows = await cursor.fetchall()
+                if not rows:
+                    return
+                last = (rows[-1][0], rows[-1][1])
+                for row in take(rows):
+                    yield CSLItem(**json.loads(row[2]))
+        
+        elif order == 'apa':
+            last_key: Optional[Tuple[str, int, str]] = None
+            while remaining is None or remaining > 0:
+                # 先頭の条件はインデックスの検索開始位置に使われる
+                where = (
+                    f"WHERE {APA_FAMILY_KEY} >= ? AND ({APA_SORT_KEY}) > (?, ?, ?)"
+                    if last_key else ""
+                )
+                async with get_pool().acquire() as conn:
+                    cursor = await conn.execute(
+                        f"""
+                        SELECT {APA_SORT_KEY}, raw_csl_json FROM works
+                        {where}
+                        ORDER BY {APA_SORT_KEY}
+                        LIMIT ?
+                        """,
+                        (*((last_key[0], *last_key) if last_key else ()), chunk_size)
+                    )
+                    rows = await cursor.fetchall()
+                if not rows:
+                    return
+                last_key = (rows[-1][0], rows[-1][1], rows[-1][2])
+                for row in take(rows):
+                    yield CSLItem(**json.loads(row[3]))
         
-        finally:
-            await conn.close()
+        else:
+            raise ValueError(f"Unknown order: {order}")
     
     @staticmethod
     async def list_all(limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """全文献をリスト"""
-        conn = await get_async_connection()
-        try:
+        async with get_pool().acquire() as conn:
             cursor = await conn.execute(
-                """
-                SELECT id, title, type, issued_year, doi, peer_reviewed, 
-                       retracted, consensus_score
-                FROM works
-                ORDER BY created_at DESC
+                f"""
+                SELECT {SUMMARY_COLUMNS}
+                FROM work_summary s
+                ORDER BY s.created_at DESC, s.work_id DESC
                 LIMIT ? OFFSET ?
                 """,
                 (limit, offset)
             )
-            rows = await cursor.fetchall()
-            
-            works = []
-            for row in rows:
-                work = dict(row)
-                
-                # 著者を取得
-                cursor = await conn.execute(
-                    """
-                    SELECT a.family, a.given
-                    FROM authors a
-                    JOIN work_authors wa ON a.id = wa.author_id
-                    WHERE wa.work_id = ?
-                    ORDER BY wa.ord
-                    """,
-                    (work['id'],)
-                )
-                authors = await cursor.fetchall()
-                work['authors'] = [
-                    f"{a[1]} {a[0]}" if a[1] else a[0]
-                    for a in authors
-                ]
-                
-                works.append(work)
-            
-            return works
+            return [WorkDAO._summary_row(row) for row in await cursor.fetchall()]
+    
+    @staticmethod
+    async def list_page(
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """文献をカーソル（キーセット）方式でページング
+
+        (created_at, work_id) の複合インデックスを辿るため、何ページ目でも1ページ目と同じコストで取得できる。
+        著者・検証状況・件数は work_summary にトリガーで集約済みなので、1ページを1回の読み取りで返す。
+        戻り値は (文献リスト, 次ページのカーソル)。最終ページでは次カーソルは None。
+        """
+        where = ""
+        params: List[Any] = []
+        if cursor:
+            where = "WHERE (s.created_at, s.work_id) < (?, ?)"
+            params.extend(decode_cursor(cursor))
+        params.append(limit + 1)
         
-        finally:
-            await conn.close()
+        async with get_pool().acquire() as conn:
+            db_cursor = await conn.execute(
+                f"""
+                SELECT {SUMMARY_COLUMNS}
+                FROM work_summary s
+                {where}
+                ORDER BY s.created_at DESC, s.work_id DESC
+                LIMIT ?
+                """,
+                params
+            )
+            works = [WorkDAO._summary_row(row) for row in await db_cursor.fetchall()]
+        
+        next_cursor = None
+        if len(works) > limit:
+            works = works[:limit]
+            last = works[-1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
+        
+        return works, next_cursor
     
     @staticmethod
     async def update(work_id: str, updates: Dict[str, Any]) -> bool:
         """文献を更新"""
-        conn = await get_async_connection()
-        try:
-            set_clauses = []
-            values = []
-            
-            for key, value in updates.items():
-                if key in ['title', 'url', 'peer_reviewed', 'retracted', 'consensus_score']:
-                    set_clauses.append(f"{key} = ?")
-                    values.append(value)
-            
-            if not set_clauses:
-                return False
-            
-            set_clauses.append("updated_at = ?")
-            values.append(datetime.utcnow().isoformat())
-            
-            values.append(work_id)
-            
+        set_clauses = []
+        values = []
+        
+        for key, value in updates.items():
+            if key in ['title', 'url', 'peer_reviewed', 'retracted', 'consensus_score']:
+                set_clauses.append(f"{key} = ?")
+                values.append(value)
+        
+        if not set_clauses:
+            return False
+        
+        set_clauses.append("updated_at = ?")
+        values.append(datetime.utcnow().isoformat())
+        
+        values.append(work_id)
+        
+        async def update(conn: aiosqlite.Connection) -> bool:
             await conn.execute(
                 f"UPDATE works SET {', '.join(set_clauses)} WHERE id = ?",
                 tuple(values)
             )
-            await conn.commit()
             return True
         
-        finally:
-            await conn.close()
+        return await run_write(update)
     
     @staticmethod
     async def delete(work_id: str) -> bool:
         """文献を削除"""
-        conn = await get_async_connection()
-        try:
+        async def delete(conn: aiosqlite.Connection) -> bool:
             await conn.execute("DELETE FROM works WHERE id = ?", (work_id,))
-            await conn.commit()
             return True
-        finally:
-            await conn.close()
+        
+        return await run_write(delete)
+
+
+UPSERT_CURRENT_CHECK_SQL = """
+INSERT INTO current_checks (work_id, kind, status, detail, http_code, checked_at)
+VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(work_id, kind) DO UPDATE SET
+    status = excluded.status,
+    detail = excluded.detail,
+    http_code = excluded.http_code,
+    checked_at = excluded.checked_at
+"""
 
 
 class CheckDAO:
-    """検証結果データアクセス"""
+    """検証結果データアクセス
+
+    current_checks に種別ごとの最新結果を upsert する。履歴（checks）には
+    ステータスが変わったときだけトリガーで記録される。
+    """
     
     @staticmethod
     async def create(
@@ -215,35 +724,209 @@ class CheckDAO:
         status: str,
         detail: str,
         http_code: Optional[int] = None
-    ) -> int:
-        """検証結果を作成"""
-        conn = await get_async_connection()
-        try:
-            cursor = await conn.execute(
-                """
-                INSERT INTO checks (work_id, kind, status, detail, http_code)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (work_id, kind, status, detail, http_code)
-            )
-            await conn.commit()
-            return cursor.lastrowid
-        finally:
-            await conn.close()
+    ) -> str:
+        """検証結果を保存（戻り値は get_by_work の id と同じ "work_id:kind"）"""
+        await CheckDAO.create_many([{
+            'work_id': work_id,
+            'kind': kind,
+            'status': status,
+            'detail': detail,
+            'http_code': http_code
+        }])
+        return f"{work_id}:{kind}"
+    
+    @staticmethod
+    async def create_many(checks: Iterable[Dict[str, Any]]) -> int:
+        """複数の検証結果を1トランザクションで保存
+
+        各要素は work_id, kind, status, detail, http_code（任意）を持つ辞書。
+        戻り値は保存した件数。
+        """
+        rows = [
+            (c['work_id'], c['kind'], c['status'], c['detail'], c.get('http_code'))
+            for c in checks
+        ]
+        if not rows:
+            return 0
+        
+        async def upsert(conn: aiosqlite.Connection) -> int:
+            await conn.executemany(UPSERT_CURRENT_CHECK_SQL, rows)
+            return len(rows)
+        
+        return await run_write(upsert)
     
     @staticmethod
     async def get_by_work(work_id: str) -> List[Dict[str, Any]]:
-        """文献の検証結果を取得"""
-        conn = await get_async_connection()
-        try:
+        """文献の最新の検証結果を取得（種別ごとに1件、id は "work_id:kind"）"""
+        async with get_pool().acquire() as conn:
             cursor = await conn.execute(
-                "SELECT * FROM checks WHERE work_id = ? ORDER BY checked_at DESC",
+                "SELECT work_id || ':' || kind AS id, * FROM current_checks "
+                "WHERE work_id = ? ORDER BY kind",
                 (work_id,)
             )
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
-        finally:
-            await conn.close()
+    
+    @staticmethod
+    async def get_history(work_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """文献の検証ステータスの変化履歴を取得（新しい順）"""
+        async with get_pool().acquire() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM checks WHERE work_id = ? ORDER BY checked_at DESC, id DESC LIMIT ?",
+                (work_id, limit)
+            )
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+    
+    @staticmethod
+    async def compact_history(older_than_days: int = 0) -> int:
+        """履歴の連続した同一ステータスの行を1行にまとめる
+
+        (work_id, kind) ごとに、直前の行とステータスが同じ行を削除する（変化した時点の行が残る）。
+        older_than_days を指定すると、それより新しい行は残す。戻り値は削除した件数。
+        """
+        async def compact(conn: aiosqlite.Connection) -> int:
+            cursor = await conn.execute(
+                """
+                DELETE FROM checks WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, status, checked_at,
+                               LAG(status) OVER (
+                                   PARTITION BY work_id, kind ORDER BY checked_at, id
+                               ) AS previous_status
+                        FROM checks
+                    )
+                    WHERE previous_status IS status
+                      AND checked_at < datetime('now', ?)
+                )
+                """,
+                (f"-{older_than_days} days",)
+            )
+            return cursor.rowcount
+        
+        return await run_write(compact)
+
+
+class CheckWriter:
+    """検証結果のバッファ付きライター
+
+    add() で受け取った結果を溜め、max_rows 件に達するか最初の追加から max_delay 秒経つと
+    CheckDAO.create_many でまとめて書き込む。多数の文献の結果が1トランザクションに入る。
+    削除済みの文献の結果は捨て、それ以外の失敗はバッファに戻して再試行する。
+    """
+    
+    def __init__(
+        self,
+        max_rows: int = CHECK_FLUSH_ROWS,
+        max_delay: float = CHECK_FLUSH_SECONDS
+    ):
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._failures = 0
+    
+    @property
+    def pending(self) -> int:
+        """未書き込みの件数"""
+        return len(self._buffer)
+    
+    async def add(self, checks: Iterable[Dict[str, Any]]):
+        """検証結果をバッファに追加（件数が上限に達したらその場で書き込む）"""
+        self._buffer.extend(checks)
+        if len(self._buffer) >= self.max_rows:
+            await self.flush()
+        elif self._buffer and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        """max_delay 秒後に書き込む"""
+        try:
+            await asyncio.sleep(self.max_delay)
+        except asyncio.CancelledError:
+            return
+        self._timer = None
+        await self.flush()
+    
+    async def flush(self) -> int:
+        """バッファの内容を書き込む（戻り値は書き込んだ件数）"""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        
+        async with self._lock:
+            checks, self._buffer = self._buffer, []
+            if not checks:
+                return 0
+            try:
+                try:
+                    written = await CheckDAO.create_many(checks)
+                except sqlite3.IntegrityError:
+                    # 検証中に削除された文献の結果だけを捨てて書き直す
+                    checks = await self._drop_deleted_works(checks)
+                    written = await CheckDAO.create_many(checks)
+            except Exception as e:
+                return self._retry_later(checks, e)
+            self._failures = 0
+            return written
+    
+    @staticmethod
+    async def _drop_deleted_works(checks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """存在しない文献（削除済み）の結果を除く"""
+        work_ids = list({c['work_id'] for c in checks})
+        existing = set()
+        async with get_pool().acquire() as conn:
+            for start in range(0, len(work_ids), DEFAULT_IMPORT_CHUNK_SIZE):
+                batch = work_ids[start:start + DEFAULT_IMPORT_CHUNK_SIZE]
+                cursor = await conn.execute(
+                    f"SELECT id FROM works WHERE id IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                existing.update(row[0] for row in await cursor.fetchall())
+        kept = [c for c in checks if c['work_id'] in existing]
+        if len(kept) < len(checks):
+            print(f"Skipped {len(checks) - len(kept)} checks for deleted works")
+        return kept
+    
+    def _retry_later(self, checks: List[Dict[str, Any]], error: Exception) -> int:
+        """書き込めなかった結果をバッファに戻して後で書き直す（CHECK_FLUSH_RETRIES 回まで）"""
+        self._failures += 1
+        if self._failures > CHECK_FLUSH_RETRIES:
+            print(f"Error saving {len(checks)} checks, giving up: {error}")
+            self._failures = 0
+            return 0
+        print(f"Error saving {len(checks)} checks, will retry: {error}")
+        self._buffer[:0] = checks
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        return 0
+    
+    async def close(self):
+        """残りを書き込んで停止（失敗した分は再試行を待つ）"""
+        await self.flush()
+        while self._buffer:
+            await asyncio.sleep(self.max_delay)
+            await self.flush()
+
+
+_check_writer: Optional[CheckWriter] = None
+
+
+def get_check_writer() -> CheckWriter:
+    """プロセス共有の検証結果ライターを取得（未作成なら作成）"""
+    global _check_writer
+    if _check_writer is None:
+        _check_writer = CheckWriter()
+    return _check_writer
+
+
+async def close_check_writer():
+    """共有ライターの残りを書き込む（close_pool より前に呼ぶ）"""
+    global _check_writer
+    if _check_writer is not None:
+        await _check_writer.close()
+        _check_writer = None
 
 
 class ReadEvidenceDAO:
@@ -259,8 +942,7 @@ class ReadEvidenceDAO:
         snippet_hash: Optional[str] = None
     ) -> int:
         """既読証跡を作成"""
-        conn = await get_async_connection()
-        try:
+        async def insert(conn: aiosqlite.Connection) -> int:
             cursor = await conn.execute(
                 """
                 INSERT INTO read_evidence 
@@ -269,24 +951,20 @@ class ReadEvidenceDAO:
                 """,
                 (work_id, pdf_path, page, dwell_secs, coverage, snippet_hash)
             )
-            await conn.commit()
             return cursor.lastrowid
-        finally:
-            await conn.close()
+        
+        return await run_write(insert)
     
     @staticmethod
     async def get_by_work(work_id: str) -> List[Dict[str, Any]]:
         """文献の既読証跡を取得"""
-        conn = await get_async_connection()
-        try:
+        async with get_pool().acquire() as conn:
             cursor = await conn.execute(
                 "SELECT * FROM read_evidence WHERE work_id = ? ORDER BY page, created_at",
                 (work_id,)
             )
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
-        finally:
-            await conn.close()
 
 
 class ClaimCardDAO:
@@ -304,8 +982,7 @@ class ClaimCardDAO:
         verified: bool = False
     ) -> str:
         """カードを作成"""
-        conn = await get_async_connection()
-        try:
+        async def insert(conn: aiosqlite.Connection) -> str:
             await conn.execute(
                 """
                 INSERT INTO claim_cards 
@@ -316,84 +993,124 @@ class ClaimCardDAO:
                 (card_id, work_id, claim, evidence_snippet, page_from,
                  page_to, limitations, verified)
             )
-            await conn.commit()
             return card_id
-        finally:
-            await conn.close()
+        
+        return await run_write(insert)
     
     @staticmethod
     async def get(card_id: str) -> Optional[Dict[str, Any]]:
         """カードを取得"""
-        conn = await get_async_connection()
-        try:
+        async with get_pool().acquire() as conn:
             cursor = await conn.execute(
                 "SELECT * FROM claim_cards WHERE id = ?",
                 (card_id,)
             )
             row = await cursor.fetchone()
             return dict(row) if row else None
-        finally:
-            await conn.close()
     
     @staticmethod
     async def get_by_work(work_id: str) -> List[Dict[str, Any]]:
         """文献のカードを取得"""
-        conn = await get_async_connection()
-        try:
+        async with get_pool().acquire() as conn:
             cursor = await conn.execute(
                 "SELECT * FROM claim_cards WHERE work_id = ? ORDER BY created_at",
                 (work_id,)
             )
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
-        finally:
-            await conn.close()
     
     @staticmethod
     async def update(card_id: str, updates: Dict[str, Any]) -> bool:
         """カードを更新"""
-        conn = await get_async_connection()
-        try:
-            set_clauses = []
-            values = []
-            
-            for key, value in updates.items():
-                if key in ['claim', 'evidence_snippet', 'page_from', 'page_to', 
-                          'limitations', 'verified']:
-                    set_clauses.append(f"{key} = ?")
-                    values.append(value)
-            
-            if not set_clauses:
-                return False
-            
-            set_clauses.append("updated_at = ?")
-            values.append(datetime.utcnow().isoformat())
-            
-            values.append(card_id)
-            
+        set_clauses = []
+        values = []
+        
+        for key, value in updates.items():
+            if key in ['claim', 'evidence_snippet', 'page_from', 'page_to', 
+                      'limitations', 'verified']:
+                set_clauses.append(f"{key} = ?")
+                values.append(value)
+        
+        if not set_clauses:
+            return False
+        
+        set_clauses.append("updated_at = ?")
+        values.append(datetime.utcnow().isoformat())
+        
+        values.append(card_id)
+        
+        async def update(conn: aiosqlite.Connection) -> bool:
             await conn.execute(
                 f"UPDATE claim_cards SET {', '.join(set_clauses)} WHERE id = ?",
                 tuple(values)
             )
-            await conn.commit()
             return True
-        finally:
-            await conn.close()
+        
+        return await run_write(update)
     
     @staticmethod
     async def delete(card_id: str) -> bool:
         """カードを削除"""
-        conn = await get_async_connection()
-        try:
+        async def delete(conn: aiosqlite.Connection) -> bool:
             await conn.execute("DELETE FROM claim_cards WHERE id = ?", (card_id,))
-            await conn.commit()
             return True
-        finally:
-            await conn.close()
+        
+        return await run_write(delete)
+
+
+class SearchDAO:
+    """全文検索（works_fts）"""
+    
+    # bm25 の列ごとの重み: title, container_title, abstract, authors, claims
+    COLUMN_WEIGHTS = (10.0, 2.0, 1.0, 5.0, 3.0)
+    
+    @staticmethod
+    def build_match_query(text: str) -> Optional[str]:
+        """入力文字列を FTS5 の MATCH 式に変換
+
+        語ごとにフレーズとして引用し、すべてを含む文献にヒットさせる（AND）。
+        trigram トークナイザは3文字未満の語を検索できないため、そうした語は無視する。
+        """
+        terms = [term for term in text.split() if len(term) >= 3]
+        if not terms:
+            return None
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    
+    @staticmethod
+    async def search(text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """文献をスコア順に検索（スニペット付き）"""
+        match = SearchDAO.build_match_query(text)
+        if match is None:
+            return []
+        
+        weights = ", ".join(str(w) for w in SearchDAO.COLUMN_WEIGHTS)
+        async with get_pool().acquire() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT w.id, w.title, w.type, w.issued_year, w.doi,
+                       s.authors_json,
+                       bm25(works_fts, {weights}) AS score,
+                       snippet(works_fts, -1, '[', ']', '…', 16) AS snippet
+                FROM works_fts
+                JOIN works_fts_ids i ON i.fts_rowid = works_fts.rowid
+                JOIN works w ON w.id = i.work_id
+                JOIN work_summary s ON s.work_id = w.id
+                WHERE works_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+                """,
+                (match, limit)
+            )
+            hits = []
+            for row in await cursor.fetchall():
+                hit = dict(row)
+                hit['authors'] = json.loads(hit.pop('authors_json'))
+                hits.append(hit)
+            return hits
 
 
 if __name__ == "__main__":
-    import asyncio
+    from refsys.db import run_with_pool
     from refsys.models import CSLName, CSLDate
     
     async def test():
@@ -419,4 +1136,4 @@ if __name__ == "__main__":
         works = await WorkDAO.list_all()
         print(f"Total works: {len(works)}")
     
-    asyncio.run(test())
+    run_with_pool(test())
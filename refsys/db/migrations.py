@@ -0,0 +1,380 @@
+"""
+スキーマのバージョン管理とマイグレーション
+"""
+import sqlite3
+from typing import List, Tuple
+import aiosqlite
+
+from .schema import (
+    CREATE_WORKS_FTS_IDS_TABLE, CREATE_WORKS_FTS_TABLE, CREATE_TRIGGERS,
+    BACKFILL_WORKS_FTS_IDS, BACKFILL_WORKS_FTS,
+)
+
+CREATE_SCHEMA_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# 一覧表示用の非正規化テーブル。書き込みはすべてトリガーで追従する。
+# 著者名は raw_csl_json から作る（work_authors は著者ごとに1行挿入されるため、
+# そちらにトリガーを張ると著者数に比例して再計算が走る）。
+SUMMARY_AUTHORS_JSON = """
+    (SELECT json_group_array(
+         coalesce(json_extract(a.value, '$.literal'),
+                  CASE WHEN json_extract(a.value, '$.given') IS NOT NULL
+                       THEN json_extract(a.value, '$.given') || ' ' || json_extract(a.value, '$.family')
+                       ELSE json_extract(a.value, '$.family') END))
+     FROM json_each({csl}, '$.author') a)
+"""
+
+# 種別ごとの最新の検証ステータス {kind: status}
+SUMMARY_CHECK_STATUS_JSON = """
+    (SELECT json_group_object(c.kind, c.status)
+     FROM checks c
+     WHERE c.work_id = {work_id}
+       AND c.id = (SELECT MAX(c2.id) FROM checks c2
+                   WHERE c2.work_id = c.work_id AND c2.kind = c.kind))
+"""
+
+# (バージョン, 名前, SQL文のリスト)。追加は末尾に、既存の内容は変更しない。
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "hot-path covering indexes", [
+        # 一覧（キーセットページング）
+        "CREATE INDEX IF NOT EXISTS idx_works_created_at ON works(created_at, id);",
+        # 著者順の取得: WHERE work_id [IN] ... ORDER BY ord
+        "CREATE INDEX IF NOT EXISTS idx_work_authors_work_ord ON work_authors(work_id, ord, author_id);",
+        # 文献ごとの検証履歴・既読証跡・カード（並び順まで索引で解決）
+        "CREATE INDEX IF NOT EXISTS idx_checks_work_checked ON checks(work_id, checked_at);",
+        "CREATE INDEX IF NOT EXISTS idx_read_evidence_work_page ON read_evidence(work_id, page, created_at);",
+        "CREATE INDEX IF NOT EXISTS idx_claim_cards_work_created ON claim_cards(work_id, created_at);",
+        # 上の複合インデックスの先頭列と重複する単一列インデックス
+        "DROP INDEX IF EXISTS idx_checks_work_id;",
+        "DROP INDEX IF EXISTS idx_read_evidence_work_id;",
+        "DROP INDEX IF EXISTS idx_claim_cards_work_id;",
+        # doi は UNIQUE 制約の自動インデックスがある
+        "DROP INDEX IF EXISTS idx_works_doi;",
+    ]),
+    (2, "work_summary table", [
+        """
+        CREATE TABLE IF NOT EXISTS work_summary (
+            work_id TEXT PRIMARY KEY,
+            title TEXT,
+            type TEXT,
+            issued_year INTEGER,
+            doi TEXT,
+            peer_reviewed INTEGER,
+            retracted INTEGER,
+            consensus_score INTEGER,
+            created_at TEXT,
+            authors_json TEXT NOT NULL DEFAULT '[]',
+            check_status TEXT NOT NULL DEFAULT '{}',
+            last_checked_at TEXT,
+            card_count INTEGER NOT NULL DEFAULT 0,
+            evidence_count INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_work_summary_created ON work_summary(created_at, work_id);",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_insert AFTER INSERT ON works BEGIN
+        INSERT OR REPLACE INTO work_summary (
+            work_id, title, type, issued_year, doi, peer_reviewed, retracted,
+            consensus_score, created_at, authors_json
+        ) VALUES (
+            NEW.id, NEW.title, NEW.type, NEW.issued_year, NEW.doi, NEW.peer_reviewed,
+            NEW.retracted, NEW.consensus_score, NEW.created_at,
+            coalesce({SUMMARY_AUTHORS_JSON.format(csl='NEW.raw_csl_json')}, '[]')
+        );
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_update AFTER UPDATE ON works BEGIN
+        UPDATE work_summary SET
+            title = NEW.title,
+            type = NEW.type,
+            issued_year = NEW.issued_year,
+            doi = NEW.doi,
+            peer_reviewed = NEW.peer_reviewed,
+            retracted = NEW.retracted,
+            consensus_score = NEW.consensus_score,
+            authors_json = coalesce({SUMMARY_AUTHORS_JSON.format(csl='NEW.raw_csl_json')}, '[]')
+        WHERE work_id = NEW.id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_delete AFTER DELETE ON works BEGIN
+        DELETE FROM work_summary WHERE work_id = OLD.id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_check AFTER INSERT ON checks BEGIN
+        UPDATE work_summary SET
+            check_status = json_set(check_status, '$."' || NEW.kind || '"', NEW.status),
+            last_checked_at = NEW.checked_at
+        WHERE work_id = NEW.work_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_card_insert AFTER INSERT ON claim_cards BEGIN
+        UPDATE work_summary SET card_count = card_count + 1 WHERE work_id = NEW.work_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_card_delete AFTER DELETE ON claim_cards BEGIN
+        UPDATE work_summary SET card_count = card_count - 1 WHERE work_id = OLD.work_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_card_move
+        AFTER UPDATE OF work_id ON claim_cards WHEN OLD.work_id IS NOT NEW.work_id BEGIN
+        UPDATE work_summary SET card_count = card_count - 1 WHERE work_id = OLD.work_id;
+        UPDATE work_summary SET card_count = card_count + 1 WHERE work_id = NEW.work_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_evidence_insert AFTER INSERT ON read_evidence BEGIN
+        UPDATE work_summary SET evidence_count = evidence_count + 1 WHERE work_id = NEW.work_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_evidence_delete AFTER DELETE ON read_evidence BEGIN
+        UPDATE work_summary SET evidence_count = evidence_count - 1 WHERE work_id = OLD.work_id;
+        END;
+        """,
+        # 既存の文献を取り込む
+        f"""
+        INSERT OR REPLACE INTO work_summary (
+            work_id, title, type, issued_year, doi, peer_reviewed, retracted,
+            consensus_score, created_at, authors_json, check_status, last_checked_at,
+            card_count, evidence_count
+        )
+        SELECT
+            w.id, w.title, w.type, w.issued_year, w.doi, w.peer_reviewed, w.retracted,
+            w.consensus_score, w.created_at,
+            coalesce({SUMMARY_AUTHORS_JSON.format(csl='w.raw_csl_json')}, '[]'),
+            coalesce({SUMMARY_CHECK_STATUS_JSON.format(work_id='w.id')}, '{{}}'),
+            (SELECT MAX(checked_at) FROM checks WHERE work_id = w.id),
+            (SELECT COUNT(*) FROM claim_cards WHERE work_id = w.id),
+            (SELECT COUNT(*) FROM read_evidence WHERE work_id = w.id)
+        FROM works w;
+        """,
+    ]),
+    (3, "works content hash", [
+        # 正規化した CSL-JSON のハッシュ（upsert インポートで未変更の文献を書き込まずにスキップする）
+        # 既存行は NULL のまま。次回の upsert で1度だけ更新される。
+        "ALTER TABLE works ADD COLUMN content_hash TEXT;",
+    ]),
+    (4, "current_checks table", [
+        # 種別ごとの最新の検証結果（検証のたびに upsert する）
+        """
+        CREATE TABLE IF NOT EXISTS current_checks (
+            work_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            status TEXT,
+            detail TEXT,
+            http_code INTEGER,
+            checked_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (work_id, kind),
+            FOREIGN KEY (work_id) REFERENCES works(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """,
+        # 既存の履歴から種別ごとの最新を取り込む（トリガー作成前に行うので履歴は増えない）
+        """
+        INSERT OR REPLACE INTO current_checks (work_id, kind, status, detail, http_code, checked_at)
+        SELECT c.work_id, c.kind, c.status, c.detail, c.http_code, c.checked_at
+        FROM checks c
+        WHERE c.id = (SELECT MAX(c2.id) FROM checks c2
+                      WHERE c2.work_id = c.work_id AND c2.kind = c.kind);
+        """,
+        # checks は履歴として、ステータスが変わったときだけ記録する
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_current_checks_insert AFTER INSERT ON current_checks BEGIN
+        INSERT INTO checks (work_id, kind, status, detail, http_code, checked_at)
+        VALUES (NEW.work_id, NEW.kind, NEW.status, NEW.detail, NEW.http_code, NEW.checked_at);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_current_checks_transition AFTER UPDATE ON current_checks
+        WHEN OLD.status IS NOT NEW.status BEGIN
+        INSERT INTO checks (work_id, kind, status, detail, http_code, checked_at)
+        VALUES (NEW.work_id, NEW.kind, NEW.status, NEW.detail, NEW.http_code, NEW.checked_at);
+        END;
+        """,
+        # work_summary の検証状況は current_checks から更新する（履歴に残らない再確認も反映）
+        "DROP TRIGGER IF EXISTS trg_work_summary_check;",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_current_insert AFTER INSERT ON current_checks BEGIN
+        UPDATE work_summary SET
+            check_status = json_set(check_status, '$."' || NEW.kind || '"', NEW.status),
+            last_checked_at = NEW.checked_at
+        WHERE work_id = NEW.work_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_work_summary_current_update AFTER UPDATE ON current_checks BEGIN
+        UPDATE work_summary SET
+            check_status = json_set(check_status, '$."' || NEW.kind || '"', NEW.status),
+            last_checked_at = NEW.checked_at
+        WHERE work_id = NEW.work_id;
+        END;
+        """,
+    ]),
+    (5, "works_fts keyed by stable ids", [
+        # works の暗黙の rowid は VACUUM で振り直されうるので、検索インデックスを作り直す
+        "DROP TRIGGER IF EXISTS trg_works_fts_insert;",
+        "DROP TRIGGER IF EXISTS trg_works_fts_update;",
+        "DROP TRIGGER IF EXISTS trg_works_fts_delete;",
+        "DROP TRIGGER IF EXISTS trg_claim_cards_fts_insert;",
+        "DROP TRIGGER IF EXISTS trg_claim_cards_fts_update;",
+        "DROP TRIGGER IF EXISTS trg_claim_cards_fts_delete;",
+        "DROP TABLE IF EXISTS works_fts;",
+        CREATE_WORKS_FTS_IDS_TABLE,
+        CREATE_WORKS_FTS_TABLE,
+        *CREATE_TRIGGERS,
+        BACKFILL_WORKS_FTS_IDS,
+        BACKFILL_WORKS_FTS,
+    ]),
+    (6, "APA export order index", [
+        # iter_items(order='apa') のキーセットページング（式は dao.APA_SORT_KEY と同じ）
+        """
+        CREATE INDEX IF NOT EXISTS idx_works_apa ON works(
+            lower(coalesce(json_extract(raw_csl_json, '$.author[0].family'), '')),
+            coalesce(issued_year, 9999), id
+        );
+        """,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+# dao.py のクエリと、その実行計画に現れるべきインデックス
+QUERY_PLAN_CHECKS: List[Tuple[str, str]] = [
+    ("SELECT * FROM works WHERE id = 'x'",
+     "sqlite_autoindex_works_1"),
+    ("SELECT id, doi FROM works WHERE id IN ('x', 'y') OR doi IN ('10.1/x')",
+     "sqlite_autoindex_works_2"),
+    ("SELECT a.family, a.given FROM authors a JOIN work_authors wa ON a.id = wa.author_id "
+     "WHERE wa.work_id = 'x' ORDER BY wa.ord",
+     "idx_work_authors_work_ord"),
+    ("SELECT * FROM work_summary ORDER BY created_at DESC, work_id DESC LIMIT 10",
+     "idx_work_summary_created"),
+    ("SELECT * FROM work_summary WHERE (created_at, work_id) < ('2024', 'x') "
+     "ORDER BY created_at DESC, work_id DESC LIMIT 10",
+     "idx_work_summary_created"),
+    ("SELECT id FROM authors WHERE family IS 'a' AND given IS 'b'",
+     "sqlite_autoindex_authors_1"),
+    ("SELECT * FROM checks WHERE work_id = 'x' ORDER BY checked_at DESC",
+     "idx_checks_work_checked"),
+    ("SELECT * FROM current_checks WHERE work_id = 'x' ORDER BY kind",
+     "PRIMARY KEY"),
+    ("SELECT * FROM read_evidence WHERE work_id = 'x' ORDER BY page, created_at",
+     "idx_read_evidence_work_page"),
+    ("SELECT * FROM claim_cards WHERE work_id = 'x' ORDER BY created_at",
+     "idx_claim_cards_work_created"),
+    ("SELECT raw_csl_json FROM works "
+     "WHERE lower(coalesce(json_extract(raw_csl_json, '$.author[0].family'), '')) >= 'a' "
+     "AND (lower(coalesce(json_extract(raw_csl_json, '$.author[0].family'), '')), "
+     "coalesce(issued_year, 9999), id) > ('a', 2000, 'x') "
+     "ORDER BY lower(coalesce(json_extract(raw_csl_json, '$.author[0].family'), '')), "
+     "coalesce(issued_year, 9999), id LIMIT 10",
+     "idx_works_apa"),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """適用済みの最新バージョンを取得"""
+    conn.execute(CREATE_SCHEMA_MIGRATIONS_TABLE)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """未適用のマイグレーションを順に適用（1件ごとに1トランザクション）"""
+    current = get_schema_version(conn)
+    conn.commit()
+    
+    applied = []
+    for version, name, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+async def get_schema_version_async(conn: aiosqlite.Connection) -> int:
+    """適用済みの最新バージョンを取得（非同期版）"""
+    await conn.execute(CREATE_SCHEMA_MIGRATIONS_TABLE)
+    cursor = await conn.execute("SELECT MAX(version) FROM schema_migrations")
+    row = await cursor.fetchone()
+    return row[0] or 0
+
+
+async def apply_migrations_async(conn: aiosqlite.Connection) -> List[int]:
+    """未適用のマイグレーションを順に適用（非同期版）"""
+    current = await get_schema_version_async(conn)
+    await conn.commit()
+    
+    applied = []
+    for version, name, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        await conn.execute("BEGIN")
+        try:
+            for sql in statements:
+                await conn.execute(sql)
+            await conn.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+def check_query_plans(conn: sqlite3.Connection) -> List[str]:
+    """QUERY_PLAN_CHECKS の各クエリが想定インデックスを使うか EXPLAIN QUERY PLAN で確認
+    
+    問題のあったクエリの説明を返す（空なら問題なし）。
+    """
+    problems = []
+    for sql, index_name in QUERY_PLAN_CHECKS:
+        plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        if index_name not in plan:
+            problems.append(f"{sql}\n  expected {index_name}, got: {plan}")
+        elif "USE TEMP B-TREE FOR ORDER BY" in plan:
+            problems.append(f"{sql}\n  sorts without index: {plan}")
+    return problems
+
+
+if __name__ == "__main__":
+    # 空のDBにスキーマとマイグレーションを適用し、実行計画を確認する
+    from refsys.db.schema import ALL_TABLES, CREATE_INDEXES
+    
+    conn = sqlite3.connect(":memory:")
+    for sql in ALL_TABLES + CREATE_INDEXES:
+        conn.execute(sql)
+    print(f"Applied migrations: {apply_migrations(conn)}")
+    
+    problems = check_query_plans(conn)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print(f"✅ All {len(QUERY_PLAN_CHECKS)} queries use their indexes")
+    raise SystemExit(1 if problems else 0)
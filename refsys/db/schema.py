@@ -97,6 +97,28 @@ CREATE TABLE IF NOT EXISTS cache (
 );
 """
 
+# 全文検索インデックスの行番号（works の暗黙の rowid は VACUUM で振り直されうるので使わない）
+# fts_rowid は INTEGER PRIMARY KEY なので変わらない
+CREATE_WORKS_FTS_IDS_TABLE = """
+CREATE TABLE IF NOT EXISTS works_fts_ids (
+    fts_rowid INTEGER PRIMARY KEY,
+    work_id TEXT NOT NULL UNIQUE
+);
+"""
+
+# 全文検索インデックス（rowid = works_fts_ids.fts_rowid）
+# trigram トークナイザは分かち書きのない日本語でも部分一致で検索できる（3文字以上）
+CREATE_WORKS_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS works_fts USING fts5(
+    title,
+    container_title,
+    abstract,
+    authors,
+    claims,
+    tokenize = 'trigram'
+);
+"""
+
 ALL_TABLES = [
     CREATE_WORKS_TABLE,
     CREATE_AUTHORS_TABLE,
@@ -105,16 +127,95 @@ ALL_TABLES = [
     CREATE_READ_EVIDENCE_TABLE,
     CREATE_CLAIM_CARDS_TABLE,
     CREATE_CACHE_TABLE,
+    CREATE_WORKS_FTS_IDS_TABLE,
+    CREATE_WORKS_FTS_TABLE,
+]
+
+# works_fts の1行分（文献ごとに著者名・カードの主張/証拠をまとめる）
+# 著者名は work_authors ではなく raw_csl_json から取る。work_authors は1行ずつ挿入されるため、
+# そちらにトリガーを張ると著者数の2乗回の再索引になる。
+WORKS_FTS_ROW_SELECT = """
+SELECT
+    i.fts_rowid,
+    w.title,
+    w.container_title,
+    json_extract(w.raw_csl_json, '$.abstract'),
+    (SELECT group_concat(
+         coalesce(json_extract(a.value, '$.literal'),
+                  trim(coalesce(json_extract(a.value, '$.given'), '') || ' ' ||
+                       coalesce(json_extract(a.value, '$.family'), ''))),
+         '; ')
+     FROM json_each(w.raw_csl_json, '$.author') a),
+    (SELECT group_concat(coalesce(c.claim, '') || ' ' || coalesce(c.evidence_snippet, ''), ' ')
+     FROM claim_cards c
+     WHERE c.work_id = w.id)
+FROM works w
+JOIN works_fts_ids i ON i.work_id = w.id
+"""
+
+WORKS_FTS_INSERT = "INSERT INTO works_fts (rowid, title, container_title, abstract, authors, claims)"
+
+
+def _reindex_work_fts(work_id: str) -> str:
+    """トリガー本体: 指定文献の検索インデックス行を作り直す"""
+    return f"""
+    DELETE FROM works_fts WHERE rowid = (SELECT fts_rowid FROM works_fts_ids WHERE work_id = {work_id});
+    {WORKS_FTS_INSERT}
+    {WORKS_FTS_ROW_SELECT} WHERE w.id = {work_id};
+    """
+
+
+# 検索インデックスを同期するトリガー
+CREATE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_works_fts_insert AFTER INSERT ON works BEGIN
+    INSERT OR IGNORE INTO works_fts_ids (work_id) VALUES (NEW.id);
+    {WORKS_FTS_INSERT}
+    {WORKS_FTS_ROW_SELECT} WHERE w.id = NEW.id;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_works_fts_update
+    AFTER UPDATE OF title, container_title, raw_csl_json ON works BEGIN
+    {_reindex_work_fts('NEW.id')}
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_works_fts_delete AFTER DELETE ON works BEGIN
+    DELETE FROM works_fts WHERE rowid = (SELECT fts_rowid FROM works_fts_ids WHERE work_id = OLD.id);
+    DELETE FROM works_fts_ids WHERE work_id = OLD.id;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_claim_cards_fts_insert AFTER INSERT ON claim_cards BEGIN
+    {_reindex_work_fts('NEW.work_id')}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_claim_cards_fts_update
+    AFTER UPDATE OF work_id, claim, evidence_snippet ON claim_cards BEGIN
+    {_reindex_work_fts('OLD.work_id')}
+    {_reindex_work_fts('NEW.work_id')}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_claim_cards_fts_delete AFTER DELETE ON claim_cards BEGIN
+    {_reindex_work_fts('OLD.work_id')}
+    END;
+    """,
 ]
 
-# インデックス
+# トリガー導入前から存在する文献を検索インデックスに追加
+BACKFILL_WORKS_FTS_IDS = "INSERT OR IGNORE INTO works_fts_ids (work_id) SELECT id FROM works;"
+BACKFILL_WORKS_FTS = f"""
+{WORKS_FTS_INSERT}
+{WORKS_FTS_ROW_SELECT} WHERE i.fts_rowid NOT IN (SELECT rowid FROM works_fts);
+"""
+
+# インデックス（以降の追加・変更は migrations.py のマイグレーションで行う）
 CREATE_INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_works_doi ON works(doi);",
     "CREATE INDEX IF NOT EXISTS idx_works_arxiv ON works(arxiv_id);",
     "CREATE INDEX IF NOT EXISTS idx_works_pubmed ON works(pubmed_id);",
     "CREATE INDEX IF NOT EXISTS idx_works_isbn ON works(isbn);",
-    "CREATE INDEX IF NOT EXISTS idx_checks_work_id ON checks(work_id);",
-    "CREATE INDEX IF NOT EXISTS idx_read_evidence_work_id ON read_evidence(work_id);",
-    "CREATE INDEX IF NOT EXISTS idx_claim_cards_work_id ON claim_cards(work_id);",
     "CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at);",
 ]
@@ -2,7 +2,7 @@
 参考文献のフォーマット: APA7 / IEEE
 """
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterable, AsyncIterator, Optional
 from refsys.models import CSLItem, CSLName
 
 
@@ -201,14 +201,16 @@ class ReferenceFormatter:
         
         lines = []
         for i, item in enumerate(items, 1):
-            ref = self.format_reference(item)
-            
-            if self.style == "ieee":
-                lines.append(f"[{i}] {ref}")
-            else:
-                lines.append(ref)
+            lines.append(self.format_entry(item, i))
         
         return '\n\n'.join(lines)
+    
+    def format_entry(self, item: CSLItem, index: int) -> str:
+        """参考文献リストの1項目（IEEE は番号付き）"""
+        ref = self.format_reference(item)
+        if self.style == "ieee":
+            return f"[{index}] {ref}"
+        return ref
 
 
 class InTextCitation:
@@ -307,6 +309,27 @@ def export_to_bibtex(items: List[CSLItem]) -> str:
     return '\n\n'.join(entries)
 
 
+async def iter_bibliography(
+    items: AsyncIterable[CSLItem],
+    style: str = "apa",
+    output_format: str = "text"
+) -> AsyncIterator[str]:
+    """参考文献リストを1項目ずつ生成（ストリーミング出力用）
+
+    並べ替えは行わないので、items は出力順で渡す。連結すると
+    format_bibliography / export_to_bibtex と同じ区切りになる。
+    """
+    formatter = ReferenceFormatter(style)
+    index = 0
+    async for item in items:
+        index += 1
+        if output_format == "bibtex":
+            entry = export_to_bibtex([item])
+        else:
+            entry = formatter.format_entry(item, index)
+        yield entry if index == 1 else "\n\n" + entry
+
+
 def _map_csl_type_to_bibtex(csl_type: str) -> str:
     """CSLタイプをBibTeXタイプにマップ"""
     mapping = {
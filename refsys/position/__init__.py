@@ -4,7 +4,11 @@
 import re
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-import httpx
+
+from refsys.verify import (
+    Verifier, create_cache_manager, get_http_client, is_retracted_record, retraction_relations,
+    single_flight
+)
 
 
 class PositionMetadata:
@@ -17,7 +21,10 @@ class PositionMetadata:
         is_meta_analysis: bool = False,
         publication_type: str = "unknown",
         year: Optional[int] = None,
-        consensus_score: int = 0
+        consensus_score: int = 0,
+        retracted: bool = False,
+        corrected: bool = False,
+        references_count: Optional[int] = None
     ):
         self.peer_reviewed = peer_reviewed
         self.citation_count = citation_count
@@ -26,6 +33,9 @@ class PositionMetadata:
         self.publication_type = publication_type
         self.year = year
         self.consensus_score = consensus_score
+        self.retracted = retracted
+        self.corrected = corrected
+        self.references_count = references_count
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -35,12 +45,19 @@ class PositionMetadata:
             'is_meta_analysis': self.is_meta_analysis,
             'publication_type': self.publication_type,
             'year': self.year,
-            'consensus_score': self.consensus_score
+            'consensus_score': self.consensus_score,
+            'retracted': self.retracted,
+            'corrected': self.corrected,
+            'references_count': self.references_count
         }
 
 
 class PositionAnalyzer:
-    """文献の位置づけ分析"""
+    """文献の位置づけ分析
+    
+    キャッシュも Verifier も渡さない場合は resolve_metadata が検証キャッシュを開くので、
+    async with で使うか close() で閉じる。
+    """
     
     REVIEW_KEYWORDS = [
         'review', 'survey', 'systematic review', 'literature review',
@@ -60,8 +77,31 @@ class PositionAnalyzer:
         'manuscript'
     }
     
-    def __init__(self, cache_manager=None):
+    # 出版物タイプごとの査読の有無（ないものは不明）
+    PEER_REVIEW_BY_PUBLICATION_TYPE = {
+        'journal': True,
+        'conference': True,
+        'preprint': False,
+        'non-peer-reviewed': False
+    }
+    
+    def __init__(self, cache_manager=None, verifier: Optional[Verifier] = None):
         self.cache = cache_manager
+        self.verifier = verifier
+        self._owns_cache = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """自分で開いたキャッシュを閉じる（渡されたキャッシュ・Verifier は閉じない）"""
+        if self._owns_cache and hasattr(self.cache, 'close'):
+            self.cache.close()
+            self.cache = None
+        self._owns_cache = False
     
     def analyze_publication_type(self, csl_type: str, container_title: Optional[str] = None) -> str:
         """出版物タイプの分析"""
@@ -88,13 +128,7 @@ class PositionAnalyzer:
     def is_peer_reviewed(self, csl_type: str, container_title: Optional[str] = None) -> Optional[bool]:
         """査読の有無判定"""
         pub_type = self.analyze_publication_type(csl_type, container_title)
-        
-        if pub_type in ['journal', 'conference']:
-            return True
-        elif pub_type in ['preprint', 'non-peer-reviewed']:
-            return False
-        else:
-            return None  # 不明
+        return self.PEER_REVIEW_BY_PUBLICATION_TYPE.get(pub_type)
     
     def is_review_article(self, title: Optional[str], container_title: Optional[str] = None) -> bool:
         """レビュー論文か判定"""
@@ -125,36 +159,56 @@ class PositionAnalyzer:
         
         return 'meta-analysis' in text or 'meta analysis' in text or 'metaanalysis' in text
     
+    async def resolve_metadata(self, doi: str) -> Optional[Dict[str, Any]]:
+        """DOIの Crossref メタデータ（Verifier.resolve_crossref と同じキャッシュを共有）"""
+        try:
+            if self.verifier is not None:
+                return await self.verifier.resolve_crossref(doi)
+            if self.cache is None:
+                self.cache = create_cache_manager()
+                self._owns_cache = True
+            async with Verifier(self.cache) as verifier:
+                return await verifier.resolve_crossref(doi)
+        except Exception as e:
+            print(f"Crossref lookup failed for {doi}: {e}")
+            return None
+    
     async def fetch_citation_count(
         self,
         doi: Optional[str] = None,
         title: Optional[str] = None
     ) -> int:
-        """引用数の取得（OpenAlex API使用）"""
+        """引用数の取得（OpenAlex API使用、同じ文献への同時の問い合わせは1回にまとめる）"""
         if not doi and not title:
             return 0
         
+        key = f"citations:doi:{doi}" if doi else f"citations:title:{title}"
+        return await single_flight(key, lambda: self._fetch_citation_count(doi, title))
+    
+    async def _fetch_citation_count(self, doi: Optional[str], title: Optional[str]) -> int:
+        """OpenAlex に問い合わせる"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                if doi:
-                    # DOIで検索
-                    url = f"https://api.openalex.org/works/doi:{doi}"
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        return data.get('cited_by_count', 0)
+            # プロセス共有のクライアント（接続を使い回す）
+            client = get_http_client()
+            if doi:
+                # DOIで検索
+                url = f"https://api.openalex.org/works/doi:{doi}"
+                response = await client.get(url, timeout=10.0)
                 
-                if title:
-                    # タイトルで検索
-                    url = f"https://api.openalex.org/works?filter=title.search:{title}"
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        results = data.get('results', [])
-                        if results:
-                            return results[0].get('cited_by_count', 0)
+                if response.status_code == 200:
+                    data = response.json()
+                    return data.get('cited_by_count', 0)
+            
+            if title:
+                # タイトルで検索
+                url = f"https://api.openalex.org/works?filter=title.search:{title}"
+                response = await client.get(url, timeout=10.0)
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    results = data.get('results', [])
+                    if results:
+                        return results[0].get('cited_by_count', 0)
         except:
             pass
         
@@ -219,7 +273,11 @@ class PositionAnalyzer:
         return max(0, min(100, score))
     
     async def analyze_work(self, work_data: Dict[str, Any]) -> PositionMetadata:
-        """文献の完全分析"""
+        """文献の完全分析
+        
+        DOIがあれば Crossref のレコード1件から出版タイプ・掲載誌・被引用数・リトラクションを導き、
+        OpenAlex への問い合わせはレコードが得られないときだけ行う。
+        """
         csl_type = work_data.get('type', 'unknown')
         container_title = work_data.get('container-title') or work_data.get('container_title')
         title = work_data.get('title')
@@ -234,21 +292,38 @@ class PositionAnalyzer:
                 if date_parts and len(date_parts) > 0 and len(date_parts[0]) > 0:
                     year = date_parts[0][0]
         
+        # Crossref のレコード（タイプ・掲載誌はこちらを優先）
+        record = await self.resolve_metadata(doi) if doi else None
+        if record and record.get('found'):
+            csl_type = record.get('type') or csl_type
+            container_title = record.get('container_title') or container_title
+        else:
+            record = None
+        
+        # 出版タイプ（Crossref の posted-content はプレプリント）
+        pub_type = self.analyze_publication_type(csl_type, container_title)
+        if record and record.get('crossref_type') == 'posted-content':
+            pub_type = 'preprint'
+        
         # 査読判定
-        peer_reviewed = self.is_peer_reviewed(csl_type, container_title)
+        peer_reviewed = self.PEER_REVIEW_BY_PUBLICATION_TYPE.get(pub_type)
         
         # レビュー/メタ解析判定
         is_review = self.is_review_article(title, container_title)
         is_meta = self.is_meta_analysis(title, work_data.get('abstract'))
         
         # 引用数取得
-        citation_count = await self.fetch_citation_count(doi, title)
-        
-        # 出版タイプ
-        pub_type = self.analyze_publication_type(csl_type, container_title)
+        if record and record.get('is_referenced_by_count') is not None:
+            citation_count = record['is_referenced_by_count']
+        else:
+            citation_count = await self.fetch_citation_count(doi, title)
         
-        # リトラクション
-        is_retracted = work_data.get('retracted', False)
+        # リトラクション（訂正は撤回として扱わず、注意表示だけにする）
+        is_retracted = bool(work_data.get('retracted', False))
+        is_corrected = False
+        if record:
+            is_retracted = is_retracted or is_retracted_record(record)
+            is_corrected = not is_retracted and bool(retraction_relations(record))
         
         # 合意度スコア計算
         consensus_score = self.calculate_consensus_score(
@@ -267,7 +342,10 @@ class PositionAnalyzer:
             is_meta_analysis=is_meta,
             publication_type=pub_type,
             year=year,
-            consensus_score=consensus_score
+            consensus_score=consensus_score,
+            retracted=is_retracted,
+            corrected=is_corrected,
+            references_count=record.get('references_count') if record else None
         )
 
 
@@ -297,6 +375,12 @@ def format_position_summary(metadata: PositionMetadata) -> str:
     else:
         lines.append("❓ 査読不明")
     
+    # リトラクション
+    if metadata.retracted:
+        lines.append("⛔ 撤回あり")
+    elif metadata.corrected:
+        lines.append("⚠️ 訂正あり（訂正内容を確認してください）")
+    
     # タイプ
     lines.append(f"📄 タイプ: {metadata.publication_type}")
     
@@ -326,8 +410,6 @@ if __name__ == "__main__":
     import asyncio
     
     async def test():
-        analyzer = PositionAnalyzer()
-        
         work_data = {
             'type': 'article-journal',
             'title': 'A systematic review of machine learning',
@@ -337,7 +419,8 @@ if __name__ == "__main__":
             'retracted': False
         }
         
-        metadata = await analyzer.analyze_work(work_data)
+        async with PositionAnalyzer() as analyzer:
+            metadata = await analyzer.analyze_work(work_data)
         print(format_position_summary(metadata))
     
     asyncio.run(test())
@@ -2,10 +2,10 @@
 FastAPI Web UI アプリケーション
 """
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi import Request
+from fastapi import Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 import json
@@ -14,11 +14,16 @@ import asyncio
 
 from refsys.models import CSLItem
 from refsys.ingest import parse_csl_from_dict, parse_csl_from_json_file, deduplicate_items
-from refsys.verify import verify_work, Verifier
+from refsys.verify import (
+    verify_work, verify_many, check_rows, cache_stats, Verifier, get_http_client, close_http_client
+)
 from refsys.position import PositionAnalyzer, format_position_summary
-from refsys.format import ReferenceFormatter, InTextCitation, export_to_bibtex
-from refsys.db.dao import WorkDAO, CheckDAO, ClaimCardDAO, ReadEvidenceDAO
-from refsys.db import init_database_async
+from refsys.format import ReferenceFormatter, InTextCitation, export_to_bibtex, iter_bibliography
+from refsys.db.dao import (
+    WorkDAO, CheckDAO, ClaimCardDAO, ReadEvidenceDAO, SearchDAO,
+    get_check_writer, close_check_writer
+)
+from refsys.db import init_database_async, get_pool, close_pool
 from refsys.readcheck import ClaimCard, ReadingScorer, ReadingEvidence
 
 app = FastAPI(
@@ -33,6 +38,19 @@ async def startup_event():
     print("🔧 データベースを初期化中...")
     await init_database_async()
     print("✅ データベース初期化完了!")
+    # 接続プールを作成し、1接続を先に開いておく
+    async with get_pool().acquire():
+        pass
+    # 上流への問い合わせはすべてこのHTTPクライアントを使い回す
+    get_http_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """アプリケーション終了時に未保存の検証結果を書き込み、接続プール・HTTPクライアントを閉じる"""
+    await close_check_writer()
+    await close_pool()
+    await close_http_client()
 
 # CORS設定（Next.jsフロントエンドからのアクセスを許可）
 app.add_middleware(
@@ -46,6 +64,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # GET, POST, PUT, DELETE等すべて許可
     allow_headers=["*"],  # すべてのヘッダーを許可
+    expose_headers=["X-Next-Cursor"],  # ページングカーソル
 )
 
 # テンプレートとスタティックファイル
@@ -68,12 +87,15 @@ async def index(request: Request):
 
 
 @app.get("/works", response_class=HTMLResponse)
-async def list_works(request: Request, limit: int = 50, offset: int = 0):
+async def list_works(request: Request, limit: int = 50, cursor: Optional[str] = None):
     """文献リスト"""
-    works = await WorkDAO.list_all(limit=limit, offset=offset)
+    try:
+        works, next_cursor = await WorkDAO.list_page(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return templates.TemplateResponse(
         "works_list.html",
-        {"request": request, "works": works}
+        {"request": request, "works": works, "limit": limit, "next_cursor": next_cursor}
     )
 
 
@@ -147,14 +169,32 @@ async def work_detail(request: Request, work_id: str):
 # ============================================
 
 @app.get("/api/works")
-async def api_list_works(limit: Optional[int] = 100):
-    """文献リスト（JSON）"""
+async def api_list_works(
+    response: Response,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None
+):
+    """文献リスト（JSON）
+
+    次ページがある場合は X-Next-Cursor ヘッダーにカーソルを返す。
+    """
     if limit is None:
         limit = 100
-    works = await WorkDAO.list_all(limit=limit)
+    try:
+        works, next_cursor = await WorkDAO.list_page(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return works
 
 
+@app.get("/api/search")
+async def api_search(q: str, limit: int = 20):
+    """全文検索（JSON）: タイトル・掲載誌・抄録・著者・引用カードを対象にスコア順で返す"""
+    return await SearchDAO.search(q, limit=limit)
+
+
 @app.get("/api/works/{work_id}")
 async def api_get_work(work_id: str):
     """文献詳細（JSON）"""
@@ -166,11 +206,23 @@ async def api_get_work(work_id: str):
 
 @app.get("/api/works/{work_id}/checks")
 async def api_get_checks(work_id: str):
-    """検証結果取得（JSON）"""
+    """検証結果取得（JSON、種別ごとの最新）"""
     checks = await CheckDAO.get_by_work(work_id)
     return checks
 
 
+@app.get("/api/works/{work_id}/checks/history")
+async def api_get_check_history(work_id: str, limit: int = 100):
+    """検証ステータスの変化履歴（JSON）"""
+    return await CheckDAO.get_history(work_id, limit=limit)
+
+
+@app.get("/api/cache/stats")
+async def api_cache_stats():
+    """検証キャッシュのヒット・ミス数（メモリ・永続、プロセス起動から）"""
+    return cache_stats()
+
+
 @app.get("/api/works/{work_id}/cards")
 async def api_get_cards(work_id: str):
     """引用カード取得（JSON）"""
@@ -292,7 +344,6 @@ async def upload_pdf(file: UploadFile = File(...)):
             doc.close()
             
             # 位置づけ分析（CSLItemをdict形式に変換）
-            analyzer = PositionAnalyzer()
             work_dict = {
                 'id': f"pdf_{datetime.now().strftime('%Y%m%d%H%M%S')}",
                 'type': 'article',
@@ -301,7 +352,8 @@ async def upload_pdf(file: UploadFile = File(...)):
                 'issued': {'date-parts': [[issued_year]]},
                 'abstract': metadata.get('subject', '')
             }
-            position = await analyzer.analyze_work(work_dict)
+            async with PositionAnalyzer() as analyzer:
+                position = await analyzer.analyze_work(work_dict)
             
             # CSL-JSON形式で作成（位置づけ情報を含む）
             csl_item = CSLItem(
@@ -347,9 +399,13 @@ async def upload_pdf(file: UploadFile = File(...)):
 @app.post("/api/works/import")
 async def import_works(
     file: Optional[UploadFile] = File(None),
-    json_data: Optional[str] = Form(None)
+    json_data: Optional[str] = Form(None),
+    upsert: bool = Form(False)
 ):
-    """文献インポート（CSL-JSON）"""
+    """文献インポート（CSL-JSON）
+
+    upsert=true の場合は登録済みの文献を更新する（内容が変わっていなければ何も書き込まない）。
+    """
     items = []
     
     if file:
@@ -382,49 +438,63 @@ async def import_works(
     # 重複排除
     unique_items, duplicates = deduplicate_items(items)
     
-    # データベースに保存
+    # 位置づけ分析（upsert 時は内容が変わっていない文献を除く）
+    unchanged = await WorkDAO.unchanged_ids(unique_items) if upsert else set()
+    async with PositionAnalyzer() as analyzer:
+        for item in unique_items:
+            if item.id in unchanged:
+                continue
+            try:
+                position = await analyzer.analyze_work(item.to_dict())
+                item.peer_reviewed = position.peer_reviewed
+                item.consensus_score = position.consensus_score
+                item.retracted = position.retracted
+            except Exception as e:
+                print(f"Error analyzing work {item.id}: {e}")
+    
+    # データベースに一括保存
+    if upsert:
+        outcomes = await WorkDAO.upsert_many(unique_items)
+    else:
+        outcomes = await WorkDAO.create_many(unique_items)
+    items_by_id = {item.id: item for item in unique_items}
+    
     created_ids = []
-    for item in unique_items:
-        try:
-            # 位置づけ分析
-            analyzer = PositionAnalyzer()
-            position = await analyzer.analyze_work(item.to_dict())
-            
-            item.peer_reviewed = position.peer_reviewed
-            item.consensus_score = position.consensus_score
-            
-            # 保存
-            work_id = await WorkDAO.create(item)
-            created_ids.append(work_id)
-            
-            # 実在性検証を非同期で実行
-            asyncio.create_task(verify_and_save(work_id, item.to_dict()))
-        
-        except Exception as e:
-            print(f"Error importing work: {e}")
+    updated_ids = []
+    for outcome in outcomes:
+        if outcome['status'] == 'created':
+            created_ids.append(outcome['id'])
+        elif outcome['status'] == 'updated':
+            updated_ids.append(outcome['id'])
+        elif outcome['status'] == 'error':
+            print(f"Error importing work {outcome['id']}: {outcome['error']}")
+    
+    # 実在性検証をバックグラウンドで一括実行
+    to_verify = [items_by_id[work_id].to_dict() for work_id in created_ids + updated_ids]
+    if to_verify:
+        asyncio.create_task(verify_and_save(to_verify))
     
     return {
         "imported": len(created_ids),
         "duplicates": len(duplicates),
-        "work_ids": created_ids
+        "existing": sum(1 for o in outcomes if o['status'] == 'exists'),
+        "updated": len(updated_ids),
+        "unchanged": sum(1 for o in outcomes if o['status'] == 'unchanged'),
+        "work_ids": created_ids + updated_ids
     }
 
 
-async def verify_and_save(work_id: str, work_data: dict):
-    """検証を実行して保存"""
+async def verify_and_save(works: List[dict]):
+    """文献をまとめて検証して保存
+
+    同時実行数・ホストごとのリクエスト数を抑えた verify_many で検証し、
+    結果は終わった順に共有ライターへ渡して多数の文献分を1トランザクションで書き込む。
+    """
     try:
-        results = await verify_work(work_data)
-        
-        for kind, result in results.items():
-            await CheckDAO.create(
-                work_id=work_id,
-                kind=result.kind,
-                status=result.status,
-                detail=result.detail,
-                http_code=result.http_code
-            )
+        async for work, results in verify_many(works):
+            await get_check_writer().add(check_rows(work['id'], results))
     except Exception as e:
-        print(f"Verification error for {work_id}: {e}")
+        print(f"Verification error: {e}")
 
 
 @app.post("/api/works/{work_id}/verify")
@@ -437,18 +507,12 @@ async def api_verify_work(work_id: str):
     # CSL-JSONを復元
     csl_data = json.loads(work['raw_csl_json'])
     
-    # 検証実行
-    results = await verify_work(csl_data)
+    # 検証実行（期限切れ直後のキャッシュはすぐ返し、取り直しはバックグラウンドで行う）
+    async with Verifier(serve_stale=True) as verifier:
+        results = await verify_work(csl_data, verifier)
     
     # 保存
-    for kind, result in results.items():
-        await CheckDAO.create(
-            work_id=work_id,
-            kind=result.kind,
-            status=result.status,
-            detail=result.detail,
-            http_code=result.http_code
-        )
+    await CheckDAO.create_many(check_rows(work_id, results))
     
     return {
         "work_id": work_id,
@@ -548,20 +612,12 @@ async def api_export_bibliography(
     format: str = 'apa'
 ):
     """参考文献リストエクスポート（JSON）"""
-    from refsys.ingest import parse_csl_from_dict
-    
-    csl_items = []
-    for work_id in work_ids:
-        work = await WorkDAO.get(work_id)
-        if work:
-            csl_json = json.loads(work['raw_csl_json'])
-            csl_item = parse_csl_from_dict(csl_json)
-            csl_items.append(csl_item)
+    csl_items = [item async for item in WorkDAO.iter_items(work_ids=work_ids)]
     
     formatter = ReferenceFormatter()
     
     if format == 'bibtex':
-        bibliography = export_to_bibtex([item.to_dict() for item in csl_items])
+        bibliography = export_to_bibtex(csl_items)
     else:
         # format_bibliographyメソッドを使用（APA形式）
         bibliography = formatter.format_bibliography(csl_items)
@@ -583,18 +639,12 @@ async def verify_work_endpoint(work_id: str):
     # CSL-JSONを復元
     csl_data = json.loads(work['raw_csl_json'])
     
-    # 検証実行
-    results = await verify_work(csl_data)
+    # 検証実行（期限切れ直後のキャッシュはすぐ返し、取り直しはバックグラウンドで行う）
+    async with Verifier(serve_stale=True) as verifier:
+        results = await verify_work(csl_data, verifier)
     
     # 保存
-    for kind, result in results.items():
-        await CheckDAO.create(
-            work_id=work_id,
-            kind=result.kind,
-            status=result.status,
-            detail=result.detail,
-            http_code=result.http_code
-        )
+    await CheckDAO.create_many(check_rows(work_id, results))
     
     return {
         "work_id": work_id,
@@ -639,16 +689,24 @@ async def create_claim_card(
 async def export_bibliography(
     style: str = "apa",
     format: str = "text",
-    limit: int = 100
+    limit: int = 100,
+    download: bool = False
 ):
-    """参考文献リストのエクスポート"""
-    works = await WorkDAO.list_all(limit=limit)
+    """参考文献リストのエクスポート
+
+    download=true の場合は全件をファイルとしてストリーミングする（limit は無視）。
+    """
+    if download:
+        # APA は SQLite 側で並べ替え、1件ずつ整形して送る（件数によらずメモリ一定）
+        order = 'apa' if format != "bibtex" and style == "apa" else 'created'
+        extension = "bib" if format == "bibtex" else "txt"
+        return StreamingResponse(
+            iter_bibliography(WorkDAO.iter_items(order=order), style, format),
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="bibliography.{extension}"'}
+        )
     
-    # CSL-JSONに変換
-    items = []
-    for work in works:
-        csl_data = json.loads(work['raw_csl_json'])
-        items.append(CSLItem(**csl_data))
+    items = [item async for item in WorkDAO.iter_items(limit=limit)]
     
     if format == "bibtex":
         output = export_to_bibtex(items)
@@ -3,13 +3,554 @@
 """
 import re
 import asyncio
+import contextvars
+import copy
 import httpx
-from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+from typing import (
+    Optional, Dict, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Set,
+    Tuple, Union
+)
 from datetime import datetime, timedelta
 import hashlib
+import ipaddress
 import json
+import os
+import random
+import socket
+import time
+import urllib.request
+from email.utils import parsedate_to_datetime
+import sqlite3
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
+import httpcore
+
+try:
+    import h2  # noqa: F401  httpx の HTTP/2 に必要（httpx[http2]）
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# verify_work で1つの検証にかける上限時間（秒）
+DEFAULT_CHECK_TIMEOUT = 20.0
+
+# 一括検証の同時実行数（文献数）と、ホストごとの同時リクエスト数
+DEFAULT_BULK_CONCURRENCY = 16
+DEFAULT_PER_HOST_CONCURRENCY = 4
+
+# ホストごとの毎秒リクエスト数の上限（各サービスの公開している制限に合わせる）
+# REFSYS_RATE_LIMITS="api.crossref.org=20,eutils.ncbi.nlm.nih.gov=10" で上書きできる
+DEFAULT_RATE_LIMITS = {
+    "doi.org": 10.0,
+    "api.crossref.org": 10.0,
+    "eutils.ncbi.nlm.nih.gov": 3.0,  # APIキーなしの上限
+    "export.arxiv.org": 1 / 3,       # 3秒に1回
+    "api.unpaywall.org": 10.0,
+}
+# 上記以外のホスト（文献のURLなど）
+DEFAULT_HOST_RATE = 5.0
+
+# 共有HTTPクライアントの接続数（一括検証の同時実行数 × 問い合わせ先のホスト数に足りるように）
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_KEEPALIVE_EXPIRY = 30.0
+# 名前解決の結果を使い回す時間（秒）
+DNS_CACHE_TTL = 300.0
+
+# レート制限・一時的なエラーで再試行するステータスと回数
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+# Retry-After がこれより長い場合は待たずに諦める（秒）
+MAX_RETRY_AFTER = 60.0
+
+# verify_work の検証の締め切り（loop.time()）。再試行の待ちがこれを越えるなら待たずに諦める
+_check_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "refsys_check_deadline", default=None
+)
+
+# SQLiteキャッシュの IN (...) / executemany あたりの件数
+CACHE_BATCH_SIZE = 500
+
+# メモリキャッシュ（永続キャッシュの手前の LRU）の件数上限と保持時間（秒）
+# REFSYS_MEMORY_CACHE_SIZE で件数上限を変更できる（0 で無効）
+DEFAULT_MEMORY_CACHE_SIZE = 10_000
+MEMORY_CACHE_TTL = 600.0
+
+# 否定的な結果をキャッシュする時間（時間）: 見つからない（404/410）、タイムアウト・通信エラー
+NOT_FOUND_TTL_HOURS = 6
+ERROR_TTL_HOURS = 0.25
+
+# serve_stale で、期限切れのキャッシュをまだ返してよい時間（時間）
+# REFSYS_MAX_STALE_HOURS で変更できる
+DEFAULT_MAX_STALE_HOURS = 72
+
+# 1リクエストでまとめて問い合わせるIDの上限（arXiv の id_list / E-utilities の id）
+ARXIV_BATCH_SIZE = 100
+PUBMED_BATCH_SIZE = 200
+# 単発の検証をまとめるために待つ時間（秒）
+BATCH_WINDOW = 0.05
+
+# Crossref のメタデータ（1 DOI につき1件）をキャッシュする時間
+CROSSREF_TTL_HOURS = 168
+
+# Crossref の type から CSL の type への対応
+CROSSREF_TYPES = {
+    "journal-article": "article-journal",
+    "proceedings-article": "paper-conference",
+    "book-chapter": "chapter",
+    "book-part": "chapter",
+    "book-section": "chapter",
+    "book": "book",
+    "monograph": "book",
+    "edited-book": "book",
+    "reference-book": "book",
+    "report": "report",
+    "dissertation": "thesis",
+    "dataset": "dataset",
+    "posted-content": "article",
+    "reference-entry": "entry",
+}
+
+# リトラクション・訂正を示す Crossref の relation
+RETRACTION_RELATIONS = ["is-correction-of", "is-retracted-by", "has-correction"]
+# そのうち撤回を示すもの（残りは訂正）
+RETRACTED_RELATIONS = ["is-retracted-by"]
+
+
+class TokenBucket:
+    """トークンバケット方式のレート制限（1ホスト分）
+    
+    rate 件/秒で補充し、最大 capacity 件まで連続で送れる。acquire は待ち時間を
+    同期的に予約してから眠るので、ロックなしで複数のタスクから使える。
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self):
+        """1リクエスト分のトークンを取得（足りなければ待つ）"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        wait = max(-self.tokens / self.rate, self.paused_until - now)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # 送らずに終わるので予約したトークンを返す
+                self._refill(time.monotonic())
+                self.tokens = min(self.capacity, self.tokens + 1)
+                raise
+    
+    def pause(self, seconds: float):
+        """サーバーに指示された間、このホストへの送信を止める"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+    
+    def set_rate(self, rate: float):
+        """レートを変更（応答ヘッダで通知された制限に合わせる）"""
+        if rate > 0 and rate != self.rate:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+            self.tokens = min(self.tokens, self.capacity)
+
+
+def load_rate_limits() -> Dict[str, float]:
+    """ホストごとのレート上限（既定値 + REFSYS_RATE_LIMITS、不正な指定は無視して表示）"""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for entry in os.environ.get("REFSYS_RATE_LIMITS", "").split(","):
+        if not entry.strip():
+            continue
+        host, _, rate = entry.partition("=")
+        try:
+            value = float(rate)
+        except ValueError:
+            value = 0.0
+        if not host.strip() or not 0 < value < float("inf"):
+            print(f"Ignoring invalid REFSYS_RATE_LIMITS entry: {entry.strip()!r}")
+            continue
+        limits[host.strip()] = value
+    return limits
+
+
+# プロセス全体で共有するホストごとのバケット（Verifier を作り直しても制限は引き継ぐ）
+_rate_limiters: Dict[str, TokenBucket] = {}
+# REFSYS_RATE_LIMITS は最初のバケット作成時に1回だけ読む
+_rate_limits: Optional[Dict[str, float]] = None
+
+
+def get_rate_limiter(host: str) -> TokenBucket:
+    """ホストのバケットを取得（未作成なら作成）"""
+    global _rate_limits
+    bucket = _rate_limiters.get(host)
+    if bucket is None:
+        if _rate_limits is None:
+            _rate_limits = load_rate_limits()
+        rate = _rate_limits.get(host, DEFAULT_HOST_RATE)
+        bucket = _rate_limiters[host] = TokenBucket(rate)
+    return bucket
+
+
+def _header(response: httpx.Response, name: str) -> Optional[str]:
+    """X-Rate-Limit-* / X-RateLimit-* のどちらの表記でも取得"""
+    return response.headers.get(f"x-rate-limit-{name}") or response.headers.get(f"x-ratelimit-{name}")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After（秒数または HTTP 日付）を秒数に変換"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def apply_rate_limit_headers(bucket: TokenBucket, response: httpx.Response):
+    """応答ヘッダの制限（Limit / Interval / Remaining / Reset）をバケットに反映"""
+    limit = _header(response, "limit")
+    if limit:
+        interval = _header(response, "interval") or "1s"
+        try:
+            seconds = float(interval.rstrip("s")) if interval.endswith("s") else float(interval)
+            bucket.set_rate(float(limit) / seconds)
+        except ValueError:
+            pass
+    
+    remaining = _header(response, "remaining")
+    reset = _header(response, "reset")
+    if remaining == "0" and reset:
+        try:
+            reset_value = float(reset)
+        except ValueError:
+            return
+        # UNIX時刻か、残り秒数か
+        wait = reset_value - time.time() if reset_value > 1e9 else reset_value
+        if 0 < wait <= MAX_RETRY_AFTER:
+            bucket.pause(wait)
+
+
+def backoff_delay(attempt: int) -> float:
+    """指数バックオフ（full jitter）の待ち時間"""
+    return random.uniform(0, BACKOFF_BASE * (2 ** attempt))
+
+
+class MicroBatcher:
+    """同時に届いた単発の要求をまとめて、1回のバッチ取得で処理する
+    
+    最初の要求から max_delay 秒たつか max_size 件たまった時点で fetch_many(keys) を呼び、
+    返ってきた {key: 結果} をそれぞれの呼び出し元に返す。同じキーの要求は1つにまとめる。
+    """
+    def __init__(
+        self,
+        fetch_many: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        max_size: int,
+        max_delay: float = BATCH_WINDOW
+    ):
+        self.fetch_many = fetch_many
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, key: str) -> Any:
+        """1件分の結果を取得（同じ時間帯の他の要求と一緒に取得する）"""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_delay, self._flush)
+        # 呼び出し元が取り消されても、同じバッチの他の呼び出し元には影響させない
+        return await asyncio.shield(future)
+    
+    def _flush(self):
+        """たまった要求を1バッチとして送り出す"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: Dict[str, asyncio.Future]):
+        try:
+            results = await self.fetch_many(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(KeyError(key))
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """キャッシュに保存した検証子から条件付きリクエストのヘッダを作る"""
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def response_validators(response: httpx.Response) -> Dict[str, Optional[str]]:
+    """応答の検証子（ETag / Last-Modified）"""
+    return {
+        'etag': response.headers.get('etag'),
+        'last_modified': response.headers.get('last-modified'),
+    }
+
+
+def crossref_record(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Crossref の /works/{doi} 応答から、判定に使うフィールドだけの正規レコードを作る"""
+    crossref_type = message.get("type")
+    titles = message.get("title") or []
+    containers = message.get("container-title") or []
+    return {
+        "found": True,
+        "doi": message.get("DOI"),
+        "crossref_type": crossref_type,
+        "type": CROSSREF_TYPES.get(crossref_type, crossref_type),
+        "title": titles[0] if titles else None,
+        "container_title": containers[0] if containers else None,
+        "is_referenced_by_count": message.get("is-referenced-by-count"),
+        "references_count": message.get("references-count"),
+        "relation": sorted(message.get("relation") or {}),
+        "updated_by": sorted({update.get("type") for update in message.get("updated-by") or []} - {None}),
+    }
+
+
+def retraction_relations(record: Dict[str, Any]) -> List[str]:
+    """正規レコードのうちリトラクション・訂正を示す relation"""
+    relations = record.get("relation") or []
+    return [rel_type for rel_type in RETRACTION_RELATIONS if rel_type in relations]
+
+
+def is_retracted_record(record: Dict[str, Any]) -> bool:
+    """正規レコードが撤回を示すか（is-retracted-by の relation か、retraction の更新通知）"""
+    relations = record.get("relation") or []
+    return (
+        any(rel_type in relations for rel_type in RETRACTED_RELATIONS)
+        or "retraction" in (record.get("updated_by") or [])
+    )
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """名前解決の結果を DNS_CACHE_TTL 秒使い回すネットワークバックエンド
+    
+    接続先のIPアドレスだけを差し替えるので、TLS の SNI・証明書の確認は元のホスト名で行われる。
+    """
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl: float = DNS_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._addresses: Dict[Tuple[str, int], Tuple[List[str], float]] = {}
+    
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        """ホスト名をIPアドレスのリストに解決（キャッシュ付き）"""
+        now = time.monotonic()
+        entry = self._addresses.get((host, port))
+        if entry and entry[1] > now:
+            return entry[0]
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._addresses[(host, port)] = (addresses, now + self.ttl)
+        return addresses
+    
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError:
+            addresses = [host]
+        
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    address, port, timeout=timeout,
+                    local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # どのアドレスにも繋がらなければ、次回は引き直す
+        self._addresses.pop((host, port), None)
+        raise error
+    
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+    
+    async def sleep(self, seconds: float):
+        await self.backend.sleep(seconds)
+
+
+class CachingDNSTransport(httpx.AsyncHTTPTransport):
+    """接続プールだけを名前解決をキャッシュするもの（CachingDNSBackend）に差し替えたトランスポート
+    
+    要求・応答の変換と httpcore の例外の対応付けは httpx.AsyncHTTPTransport のものを使う。
+    """
+    def __init__(self, http2: bool = False, limits: httpx.Limits = httpx.Limits()):
+        super().__init__(http2=http2, limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=CachingDNSBackend(httpcore.AnyIOBackend()),
+        )
+
+
+def env_proxy_mounts(
+    http2: bool = False,
+    limits: httpx.Limits = httpx.Limits()
+) -> Dict[str, Optional[httpx.AsyncBaseTransport]]:
+    """環境変数のプロキシ（HTTP(S)_PROXY / ALL_PROXY / NO_PROXY）を AsyncClient の mounts にする
+    
+    transport を渡すと httpx は環境変数のプロキシを読まないので、httpx と同じ規則で
+    プロキシを通すURLにだけプロキシのトランスポートを割り当てる（None は transport を使う）。
+    """
+    proxies = urllib.request.getproxies()
+    no_proxy = [host.strip() for host in proxies.get("no", "").split(",") if host.strip()]
+    if "*" in no_proxy:
+        return {}
+    
+    mounts: Dict[str, Optional[httpx.AsyncBaseTransport]] = {}
+    for scheme in ("http", "https", "all"):
+        url = proxies.get(scheme)
+        if url:
+            mounts[f"{scheme}://"] = httpx.AsyncHTTPTransport(
+                proxy=url if "://" in url else f"http://{url}", http2=http2, limits=limits
+            )
+    if not mounts:
+        return {}
+    
+    for host in no_proxy:
+        if "://" in host:
+            mounts[host] = None
+            continue
+        try:
+            address = ipaddress.ip_address(host.split("/")[0])
+        except ValueError:
+            address = None
+        if address is not None and address.version == 6:
+            mounts[f"all://[{host}]"] = None
+        elif address is not None or host.lower() == "localhost":
+            mounts[f"all://{host}"] = None
+        else:
+            # ".example.com" はサブドメインだけ、"example.com" はそれ自身とサブドメイン
+            mounts[f"all://*{host}"] = None
+    return mounts
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """上流への問い合わせ用のHTTPクライアントを作成（HTTP/2・keep-alive・DNSキャッシュ・環境変数のプロキシ）"""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+    
+    return httpx.AsyncClient(
+        transport=CachingDNSTransport(http2=HTTP2_AVAILABLE, limits=limits),
+        mounts=env_proxy_mounts(http2=HTTP2_AVAILABLE, limits=limits),
+        timeout=httpx.Timeout(30.0),
+        follow_redirects=True
+    )
+
+
+# プロセスで共有するHTTPクライアント（作成したイベントループでだけ使う）
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# 作成したループの終了時に共有クライアントを閉じる非同期ジェネレータ（参照を持っておく）
+_http_client_closer: Optional[AsyncIterator[None]] = None
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    """ループの終了時（shutdown_asyncgens）にクライアントを閉じる
+    
+    接続は作成したループでしか閉じられないので、close_http_client を呼ばずに
+    asyncio.run が終わっても、ループが閉じる前に閉じておく。
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _close_in_loop(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+    """別のイベントループで作ったクライアントを、そのループで閉じる（または閉じる予約をする）"""
+    if loop.is_closed():
+        # 終了時に _close_on_loop_shutdown で閉じている
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        loop.create_task(client.aclose())
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """共有のHTTPクライアントを取得（未作成・別のイベントループなら作成し、古いものは閉じる）"""
+    global _http_client, _http_client_loop, _http_client_closer
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        if _http_client is not None and not _http_client.is_closed:
+            _close_in_loop(_http_client, _http_client_loop)
+        _http_client = create_http_client()
+        _http_client_loop = loop
+        _http_client_closer = _close_on_loop_shutdown(_http_client)
+        asyncio.ensure_future(_http_client_closer.__anext__())
+    return _http_client
+
+
+async def close_http_client():
+    """共有のHTTPクライアントを閉じる（アプリ・CLIの終了時）"""
+    global _http_client, _http_client_loop, _http_client_closer
+    if _http_client is not None:
+        if _http_client_loop is asyncio.get_running_loop():
+            await _http_client.aclose()
+        else:
+            _close_in_loop(_http_client, _http_client_loop)
+        _http_client = None
+        _http_client_loop = None
+        _http_client_closer = None
+
 
 class VerificationResult:
     """検証結果"""
@@ -27,6 +568,8 @@ class VerificationResult:
         self.http_code = http_code
         self.alternative_urls = alternative_urls or []
         self.checked_at = datetime.utcnow().isoformat()
+        # 期限切れのキャッシュから返した結果（バックグラウンドで更新中）
+        self.stale = False
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -35,8 +578,23 @@ class VerificationResult:
             "detail": self.detail,
             "http_code": self.http_code,
             "alternative_urls": self.alternative_urls,
-            "checked_at": self.checked_at
+            "checked_at": self.checked_at,
+            "stale": self.stale
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VerificationResult":
+        """to_dict の結果（キャッシュの値）から復元"""
+        result = cls(
+            kind=data["kind"],
+            status=data["status"],
+            detail=data["detail"],
+            http_code=data.get("http_code"),
+            alternative_urls=data.get("alternative_urls")
+        )
+        if data.get("checked_at"):
+            result.checked_at = data["checked_at"]
+        return result
 
 
 class CacheManager:
@@ -60,23 +618,47 @@ class CacheManager:
             with open(cache_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # 有効期限チェック
+            # 有効期限チェック（検証子のあるもの・期限切れ直後のものは再検証と serve_stale に使うので残す）
             if 'expires_at' in data:
                 expires_at = datetime.fromisoformat(data['expires_at'])
-                if datetime.utcnow() > expires_at:
-                    cache_path.unlink()
+                now = datetime.utcnow()
+                if now > expires_at:
+                    long_expired = now - expires_at > timedelta(hours=DEFAULT_MAX_STALE_HOURS)
+                    if long_expired and not data.get('etag') and not data.get('last_modified'):
+                        cache_path.unlink()
                     return None
             
             return data.get('value')
         except:
             return None
     
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """有効期限切れも含めてエントリを取得（value / etag / last_modified / expired）"""
+        cache_path = self._get_cache_path(key)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if 'value' not in data:
+            return None
+        
+        expires_at = data.get('expires_at')
+        return {
+            'value': data['value'],
+            'etag': data.get('etag'),
+            'last_modified': data.get('last_modified'),
+            'expires_at': expires_at,
+            'expired': bool(expires_at) and datetime.utcnow() > datetime.fromisoformat(expires_at)
+        }
+    
     def set(
         self,
         key: str,
         value: Any,
-        ttl_hours: int = 24,
-        etag: Optional[str] = None
+        ttl_hours: float = 24,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
     ):
         """キャッシュに保存"""
         cache_path = self._get_cache_path(key)
@@ -85,33 +667,718 @@ class CacheManager:
             'value': value,
             'cached_at': datetime.utcnow().isoformat(),
             'expires_at': (datetime.utcnow() + timedelta(hours=ttl_hours)).isoformat(),
-            'etag': etag
+            'etag': etag,
+            'last_modified': last_modified
         }
         
         with open(cache_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    def refresh(self, key: str, ttl_hours: float = 24) -> bool:
+        """値はそのままで有効期限だけ延ばす（304 Not Modified のとき）"""
+        cache_path = self._get_cache_path(key)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        data['expires_at'] = (datetime.utcnow() + timedelta(hours=ttl_hours)).isoformat()
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return True
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """複数キーをまとめて取得（ヒットしたものだけ返す）"""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+    
+    def set_many(
+        self,
+        entries: Dict[str, Any],
+        ttl_hours: float = 24,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """複数キーをまとめて保存"""
+        for key, value in entries.items():
+            self.set(key, value, ttl_hours=ttl_hours, etag=etag, last_modified=last_modified)
+
+
+class SQLiteCacheManager:
+    """APIレスポンスキャッシュ管理（SQLiteの cache テーブル）
+    
+    CacheManager と同じインターフェースで、1ファイル1キーの代わりに1行1キーで保存する。
+    行のキーは CacheManager のファイル名と同じくキーのMD5なので、旧キャッシュをそのまま移行できる。
+    有効期限切れの掃除は expires_at のインデックスで行う。
+    本体DBとは別ファイル（get_cache_db_path）に置くので、書き込みキューの書き込みとロックを取り合わない。
+    """
+    def __init__(self, db_path: Optional[Path] = None):
+        from refsys.db import get_cache_db_path
+        from refsys.db.schema import CREATE_CACHE_TABLE
+        
+        self.db_path = db_path or get_cache_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+        # 読み取りと書き込みが互いを待たないように WAL にする（キャッシュなので同期は緩めてよい）
+        self.conn.execute("PRAGMA journal_mode = WAL;")
+        self.conn.execute("PRAGMA synchronous = NORMAL;")
+        self.conn.execute(CREATE_CACHE_TABLE)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at);")
+        self.conn.commit()
+    
+    def close(self):
+        """接続を閉じる"""
+        self.conn.close()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """キャッシュから取得"""
+        return self.get_many([key]).get(key)
+    
+    @staticmethod
+    def _hash_key(key: str) -> str:
+        """行のキー（CacheManager のファイル名と同じ）"""
+        return hashlib.md5(key.encode()).hexdigest()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """複数キーをまとめて取得（有効期限内でヒットしたものだけ返す）"""
+        hashed = {self._hash_key(key): key for key in keys}
+        hashes = list(hashed)
+        now = datetime.utcnow().isoformat()
+        found = {}
+        
+        for start in range(0, len(hashes), CACHE_BATCH_SIZE):
+            batch = hashes[start:start + CACHE_BATCH_SIZE]
+            rows = self.conn.execute(
+                f"""
+                SELECT key, value FROM cache
+                WHERE key IN ({','.join('?' * len(batch))})
+                  AND (expires_at IS NULL OR expires_at > ?)
+                """,
+                batch + [now]
+            ).fetchall()
+            for key_hash, value in rows:
+                try:
+                    found[hashed[key_hash]] = json.loads(value)
+                except (TypeError, ValueError):
+                    continue
+        
+        return found
+    
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """有効期限切れも含めてエントリを取得（value / etag / last_modified / expired）"""
+        row = self.conn.execute(
+            "SELECT value, etag, last_modified, expires_at FROM cache WHERE key = ?",
+            (self._hash_key(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        value, etag, last_modified, expires_at = row
+        try:
+            value = json.loads(value)
+        except (TypeError, ValueError):
+            return None
+        return {
+            'value': value,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': expires_at,
+            'expired': expires_at is not None and expires_at <= datetime.utcnow().isoformat()
+        }
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_hours: float = 24,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """キャッシュに保存"""
+        self.set_many({key: value}, ttl_hours=ttl_hours, etag=etag, last_modified=last_modified)
+    
+    def set_many(
+        self,
+        entries: Dict[str, Any],
+        ttl_hours: float = 24,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """複数キーを1トランザクションで保存"""
+        now = datetime.utcnow()
+        expires_at = (now + timedelta(hours=ttl_hours)).isoformat()
+        rows = [
+            (self._hash_key(key), json.dumps(value, ensure_ascii=False), etag, last_modified,
+             now.isoformat(), expires_at)
+            for key, value in entries.items()
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO cache (key, value, etag, last_modified, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    created_at = excluded.created_at,
+                    expires_at = excluded.expires_at
+                """,
+                rows
+            )
+    
+    def refresh(self, key: str, ttl_hours: float = 24) -> bool:
+        """値はそのままで有効期限だけ延ばす（304 Not Modified のとき）"""
+        expires_at = (datetime.utcnow() + timedelta(hours=ttl_hours)).isoformat()
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE cache SET expires_at = ? WHERE key = ?",
+                (expires_at, self._hash_key(key))
+            )
+        return cursor.rowcount > 0
+    
+    def purge_expired(self, include_all: bool = False) -> int:
+        """有効期限切れのエントリを削除（expires_at のインデックスで範囲削除）
+        
+        期限切れから REFSYS_MAX_STALE_HOURS 以内のもの（serve_stale で返す）と、
+        検証子のあるもの（条件付きで再検証できる）は残す。include_all=True なら期限切れをすべて削除する。
+        """
+        if include_all:
+            cutoff = datetime.utcnow()
+            keep_validated = ""
+        else:
+            max_stale_hours = float(os.environ.get("REFSYS_MAX_STALE_HOURS", DEFAULT_MAX_STALE_HOURS))
+            cutoff = datetime.utcnow() - timedelta(hours=max_stale_hours)
+            keep_validated = " AND etag IS NULL AND last_modified IS NULL"
+        with self.conn:
+            cursor = self.conn.execute(
+                f"DELETE FROM cache WHERE expires_at < ?{keep_validated}",
+                (cutoff.isoformat(),)
+            )
+        return cursor.rowcount
+    
+    def import_json_dir(self, cache_dir: Path, remove_files: bool = False) -> int:
+        """旧 CacheManager のJSONディレクトリを一括で取り込む（有効期限切れは除外）
+        
+        remove_files=True の場合、取り込みをコミットしたファイルと期限切れのファイルを削除する。
+        戻り値は取り込んだ件数。
+        """
+        now = datetime.utcnow().isoformat()
+        imported = 0
+        batch = []
+        batch_paths = []
+        
+        def flush():
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO cache (key, value, etag, last_modified, created_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    batch
+                )
+            if remove_files:
+                for path in batch_paths:
+                    path.unlink(missing_ok=True)
+            batch.clear()
+            batch_paths.clear()
+        
+        for cache_path in Path(cache_dir).glob("*.json"):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            
+            expires_at = data.get('expires_at')
+            if 'value' not in data or (expires_at and expires_at < now):
+                if remove_files:
+                    cache_path.unlink(missing_ok=True)
+                continue
+            
+            batch.append((
+                cache_path.stem,
+                json.dumps(data['value'], ensure_ascii=False),
+                data.get('etag'),
+                data.get('last_modified'),
+                data.get('cached_at'),
+                expires_at
+            ))
+            batch_paths.append(cache_path)
+            imported += 1
+            if len(batch) >= CACHE_BATCH_SIZE:
+                flush()
+        
+        if batch:
+            flush()
+        return imported
+
+
+class MemoryCache:
+    """件数上限つきの LRU キャッシュ（エントリごとに有効期限を持つ）"""
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """取得（期限切れは削除して None）"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl_seconds: float = MEMORY_CACHE_TTL):
+        """保存（上限を超えたら最も長く使われていないものから捨てる）"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        self._entries.clear()
+
+
+# プロセス全体で共有するメモリキャッシュとヒット・ミス数（Verifier を作り直しても引き継ぐ）
+_memory_cache: Optional[MemoryCache] = None
+_cache_counters = {
+    "memory": {"hits": 0, "misses": 0},
+    "persistent": {"hits": 0, "misses": 0},
+}
+
+
+def get_memory_cache() -> MemoryCache:
+    """共有のメモリキャッシュを取得（未作成なら作成）"""
+    global _memory_cache
+    if _memory_cache is None:
+        size = int(os.environ.get("REFSYS_MEMORY_CACHE_SIZE", DEFAULT_MEMORY_CACHE_SIZE))
+        _memory_cache = MemoryCache(size)
+    return _memory_cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """メモリ・永続キャッシュそれぞれのヒット数・ミス数・ヒット率"""
+    stats = {}
+    for tier, counter in _cache_counters.items():
+        lookups = counter["hits"] + counter["misses"]
+        stats[tier] = {
+            **counter,
+            "hit_rate": round(counter["hits"] / lookups, 3) if lookups else None,
+        }
+    memory = get_memory_cache()
+    stats["memory"]["size"] = len(memory)
+    stats["memory"]["max_entries"] = memory.max_entries
+    return stats
+
+
+class TieredCache:
+    """メモリの LRU を永続キャッシュ（CacheManager / SQLiteCacheManager）の手前に置く2層キャッシュ
+    
+    取得はメモリ → 永続の順に探し、永続側で見つかったものはメモリに載せる。
+    保存は両方に書く。メモリ側の保持時間は MEMORY_CACHE_TTL とエントリの ttl の短い方。
+    """
+    def __init__(self, store, memory: Optional[MemoryCache] = None):
+        self.store = store
+        self.memory = memory if memory is not None else get_memory_cache()
+    
+    def close(self):
+        """永続キャッシュを閉じる"""
+        if hasattr(self.store, 'close'):
+            self.store.close()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """キャッシュから取得"""
+        return self.get_many([key]).get(key)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """複数キーをまとめて取得（メモリにないものだけ永続キャッシュに問い合わせる）"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.memory.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        _cache_counters["memory"]["hits"] += len(found)
+        _cache_counters["memory"]["misses"] += len(missing)
+        
+        if missing:
+            stored = self.store.get_many(missing)
+            _cache_counters["persistent"]["hits"] += len(stored)
+            _cache_counters["persistent"]["misses"] += len(missing) - len(stored)
+            for key, value in stored.items():
+                self.memory.set(key, value)
+            found.update(stored)
+        
+        return found
+    
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """有効期限切れも含めて永続キャッシュのエントリを取得（検証子つき）"""
+        return self.store.get_entry(key)
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_hours: float = 24,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """キャッシュに保存"""
+        self.set_many({key: value}, ttl_hours=ttl_hours, etag=etag, last_modified=last_modified)
+    
+    def set_many(
+        self,
+        entries: Dict[str, Any],
+        ttl_hours: float = 24,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """複数キーをまとめて保存"""
+        self.store.set_many(entries, ttl_hours=ttl_hours, etag=etag, last_modified=last_modified)
+        ttl_seconds = min(MEMORY_CACHE_TTL, ttl_hours * 3600)
+        for key, value in entries.items():
+            self.memory.set(key, value, ttl_seconds)
+    
+    def refresh(self, key: str, ttl_hours: float = 24, value: Any = None) -> bool:
+        """有効期限だけ延ばす（value を渡すとメモリにも載せ直す）"""
+        refreshed = self.store.refresh(key, ttl_hours=ttl_hours)
+        if value is not None:
+            self.memory.set(key, value, min(MEMORY_CACHE_TTL, ttl_hours * 3600))
+        return refreshed
+
+
+def create_cache_manager():
+    """設定に応じたキャッシュ管理を作成（REFSYS_CACHE_BACKEND: sqlite / file）
+    
+    どちらの場合もプロセス共有のメモリキャッシュを手前に置く。
+    """
+    backend = os.environ.get("REFSYS_CACHE_BACKEND", "sqlite").lower()
+    if backend == "file":
+        cache_dir = os.environ.get("REFSYS_CACHE_DIR")
+        return TieredCache(CacheManager(Path(cache_dir) if cache_dir else None))
+    return TieredCache(SQLiteCacheManager())
+
+
+# 取得中のリクエスト（キャッシュキーごと、プロセス全体で Verifier をまたいで共有）
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+async def single_flight(
+    key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    started: Optional[Set[asyncio.Future]] = None
+) -> Any:
+    """同じキーの取得が進行中ならその結果を待ち、なければ fetch() を始める
+    
+    キャッシュは応答が返ってから埋まるので、同時に同じものを求められると重複して
+    問い合わせてしまう。それを1回にまとめる。呼び出し元が取り消されても取得は続ける。
+    started を渡すと、ここで始めた取得を終わるまでその集合に入れておく。
+    """
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(fetch())
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+        if started is not None:
+            started.add(future)
+            future.add_done_callback(started.discard)
+    return await asyncio.shield(future)
+
+
+# serve_stale のバックグラウンド更新（キャッシュキーごとに1つ、終わるまで参照を持つ）
+_stale_refreshes: Dict[str, asyncio.Task] = {}
+
+
+async def _refresh_stale(refresh: Callable[["Verifier"], Awaitable[Any]]):
+    """期限切れのエントリを取り直してキャッシュを更新（呼び出し元の Verifier とは独立、失敗したら既存のエントリを残す）"""
+    # 呼び出し元の検証の締め切りは引き継がない
+    _check_deadline.set(None)
+    try:
+        async with Verifier(background=True) as verifier:
+            await refresh(verifier)
+    except Exception as e:
+        print(f"Background cache refresh failed: {e}")
 
 
 class Verifier:
-    """文献検証器"""
-    def __init__(self, cache_manager: Optional[CacheManager] = None):
-        self.cache = cache_manager or CacheManager()
-        self.client = None
+    """文献検証器
+    
+    serve_stale=True では、期限切れから max_stale_hours 以内のキャッシュを stale=True の
+    結果としてすぐに返し、取り直しはバックグラウンドで行う（対話的な画面向け）。
+    HTTPクライアントは client を渡さなければプロセス共有のもの（get_http_client）を使う。
+    background=True（バックグラウンド更新用）では、成功した応答（200 / 304）の結果だけで
+    キャッシュを書き換え、失敗したときは既存のエントリに手を付けない。
+    """
+    def __init__(
+        self,
+        cache_manager: Optional[CacheManager] = None,
+        per_host_limit: int = DEFAULT_PER_HOST_CONCURRENCY,
+        client: Optional[httpx.AsyncClient] = None,
+        serve_stale: bool = False,
+        max_stale_hours: Optional[float] = None,
+        background: bool = False
+    ):
+        self._owns_cache = cache_manager is None
+        self.cache = cache_manager or create_cache_manager()
+        self.client = client
+        self.per_host_limit = per_host_limit
+        self.serve_stale = serve_stale
+        self.background = background
+        if max_stale_hours is None:
+            max_stale_hours = float(os.environ.get("REFSYS_MAX_STALE_HOURS", DEFAULT_MAX_STALE_HOURS))
+        self.max_stale_hours = max_stale_hours
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # この Verifier（のキャッシュ・セマフォ）で始めた共有の取得
+        self._flights: Set[asyncio.Future] = set()
+        # 同時に検証される arXiv / PubMed のIDを1リクエストにまとめる
+        self._arxiv_batcher = MicroBatcher(self._fetch_arxiv, ARXIV_BATCH_SIZE)
+        self._pubmed_batcher = MicroBatcher(self._fetch_pubmed, PUBMED_BATCH_SIZE)
     
     async def __aenter__(self):
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        )
+        if self.client is None:
+            self.client = get_http_client()
         return self
     
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """ホストごとのレート・同時リクエスト数を守って送信
+        
+        429 / 5xx の一時的なエラーは Retry-After（なければ指数バックオフ + ジッター）だけ
+        待って MAX_RETRIES 回まで再試行する。それでも駄目なら最後の応答を返す。
+        """
+        host = httpx.URL(url).host
+        bucket = get_rate_limiter(host)
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        
+        for attempt in range(MAX_RETRIES + 1):
+            await bucket.acquire()
+            async with semaphore:
+                response = await self.client.request(method, url, **kwargs)
+            apply_rate_limit_headers(bucket, response)
+            
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                return response
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            # 待っている間に検証がタイムアウトするなら、最後の応答で結果を出す
+            deadline = _check_deadline.get()
+            if deadline is not None and asyncio.get_running_loop().time() + delay >= deadline:
+                return response
+            # 同じホストへの他のリクエストも一緒に待たせる
+            bucket.pause(delay)
+            await asyncio.sleep(delay)
+        
+        return response
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client:
-            await self.client.aclose()
+        # 始めた共有の取得は他の Verifier の呼び出し元も待っているので、キャッシュを閉じる前に終わらせる
+        if self._flights:
+            await asyncio.wait(list(self._flights))
+        # HTTPクライアントは共有（または呼び出し元のもの）なので閉じない
+        if self._owns_cache and hasattr(self.cache, 'close'):
+            self.cache.close()
+    
+    def _cache_negative(
+        self,
+        cache_key: str,
+        result: VerificationResult,
+        ttl_hours: float = ERROR_TTL_HOURS
+    ) -> VerificationResult:
+        """タイムアウト・通信エラーの結果を短時間だけキャッシュして返す
+        
+        期限切れでも前回の有効な結果があれば、そちらを残して stale として返す。
+        """
+        if self.background:
+            return result
+        previous = self._keep_previous(cache_key)
+        if previous is not None:
+            kept = VerificationResult.from_dict(previous)
+            kept.stale = True
+            return kept
+        self.cache.set(cache_key, result.to_dict(), ttl_hours=ttl_hours)
+        return result
+    
+    def _cache_errors(
+        self,
+        kind: str,
+        results: Dict[str, VerificationResult]
+    ) -> Dict[str, VerificationResult]:
+        """_cache_negative の一括版（IDごとの通信エラーの結果）"""
+        if self.background:
+            return results
+        errors = {}
+        for id_, result in list(results.items()):
+            previous = self._keep_previous(f"{kind}:{id_}")
+            if previous is not None:
+                results[id_] = VerificationResult.from_dict(previous)
+                results[id_].stale = True
+            else:
+                errors[id_] = result
+        self._cache_results(kind, errors, ttl_hours=ERROR_TTL_HOURS)
+        return results
+    
+    def _keep_previous(self, cache_key: str) -> Optional[Any]:
+        """通信エラー時に、前回の有効な値（期限切れを含む）を返す
+        
+        行と検証子（ETag / Last-Modified）はそのまま残し、ERROR_TTL_HOURS の間だけ有効期限を延ばす
+        （その間は問い合わせ直さない）。前回の値がない、または前回もエラーなら None。
+        """
+        entry = self.cache.get_entry(cache_key)
+        if not entry or not isinstance(entry['value'], dict):
+            return None
+        value = entry['value']
+        if value.get('error') or value.get('status') == 'warn':
+            return None
+        self.cache.refresh(cache_key, ttl_hours=ERROR_TTL_HOURS, value=value)
+        return value
+    
+    @staticmethod
+    def _result_ttl(result: VerificationResult, ttl_hours: float) -> float:
+        """結果の保存期間（fail は NOT_FOUND_TTL_HOURS、warn は ERROR_TTL_HOURS まで）"""
+        if result.status == 'fail':
+            return NOT_FOUND_TTL_HOURS
+        if result.status == 'warn':
+            return min(ttl_hours, ERROR_TTL_HOURS)
+        return ttl_hours
+    
+    def _cache_results(
+        self,
+        kind: str,
+        results: Dict[str, VerificationResult],
+        ttl_hours: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """IDごとの結果を保存（状態ごとの保存期間で、検証子があれば一緒に）"""
+        by_ttl: Dict[float, Dict[str, Any]] = {}
+        for id_, result in results.items():
+            if self.background and result.status != 'ok':
+                continue
+            entry_ttl = self._result_ttl(result, ttl_hours)
+            by_ttl.setdefault(entry_ttl, {})[f"{kind}:{id_}"] = result.to_dict()
+        for entry_ttl, entries in by_ttl.items():
+            self.cache.set_many(entries, ttl_hours=entry_ttl, etag=etag, last_modified=last_modified)
+    
+    def _stale_value(
+        self,
+        cache_key: str,
+        refresh: Callable[["Verifier"], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """serve_stale のとき、期限切れから max_stale_hours 以内の値を返し、取り直しを始める"""
+        if not self.serve_stale:
+            return None
+        entry = self.cache.get_entry(cache_key)
+        if not entry or not entry.get('expired') or not entry.get('expires_at'):
+            return None
+        expired_for = datetime.utcnow() - datetime.fromisoformat(entry['expires_at'])
+        if expired_for > timedelta(hours=self.max_stale_hours):
+            return None
+        
+        if cache_key not in _stale_refreshes:
+            task = asyncio.ensure_future(_refresh_stale(refresh))
+            _stale_refreshes[cache_key] = task
+            task.add_done_callback(lambda _: _stale_refreshes.pop(cache_key, None))
+        return entry['value']
+    
+    def _stale_result(
+        self,
+        cache_key: str,
+        refresh: Callable[["Verifier"], Awaitable[Any]]
+    ) -> Optional[VerificationResult]:
+        """_stale_value の検証結果版（stale=True を付ける）"""
+        value = self._stale_value(cache_key, refresh)
+        if value is None:
+            return None
+        result = VerificationResult.from_dict(value)
+        result.stale = True
+        return result
+    
+    async def resolve_crossref(self, doi: str) -> Optional[Dict[str, Any]]:
+        """DOIの Crossref メタデータ（正規レコード）を取得
+        
+        1つのDOIにつき1回だけ取得してキャッシュし、DOI検証・リトラクション・出版タイプ・
+        被引用数はすべてこのレコードから導く。同じDOIを同時に求められた場合は1回の取得を共有する
+        （single_flight）。
+        Crossref に登録がなければ found=False のレコード、取得できなければ None を返す。
+        """
+        cache_key = f"crossref:{doi.lower()}"
+        cached = self.cache.get(cache_key)
+        if cached:
+            return cached
+        
+        stale = self._stale_value(cache_key, lambda verifier: verifier.resolve_crossref(doi))
+        if stale is not None:
+            # キャッシュの値は共有されているので、印を付けた複製を返す
+            return {**stale, "stale": True}
+        
+        return await single_flight(cache_key, lambda: self._fetch_crossref(doi, cache_key), self._flights)
+    
+    async def _fetch_crossref(self, doi: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Crossref API から正規レコードを取得してキャッシュに保存
+        
+        期限切れのエントリに検証子があれば条件付きで問い合わせ、304 なら保存済みの
+        レコードの有効期限だけを延ばす（再ダウンロード・再解析をしない）。
+        """
+        api_url = f"https://api.crossref.org/works/{doi}"
+        entry = self.cache.get_entry(cache_key)
+        try:
+            response = await self._request(
+                'GET', api_url, headers=conditional_headers(entry), timeout=10.0
+            )
+        except httpx.TransportError as e:
+            record = {"found": False, "doi": doi, "error": str(e) or type(e).__name__}
+            if self.background:
+                return record
+            # 前回のレコードがあればそれを使う（検証子も残す）
+            previous = self._keep_previous(cache_key)
+            if previous is not None:
+                return {**previous, "stale": True}
+            # なければ短時間だけ「取得できなかった」と覚えておく
+            self.cache.set(cache_key, record, ttl_hours=ERROR_TTL_HOURS)
+            return record
+        
+        if response.status_code == 304 and entry:
+            record = entry['value']
+            ttl_hours = CROSSREF_TTL_HOURS if record.get('found') else NOT_FOUND_TTL_HOURS
+            self.cache.refresh(cache_key, ttl_hours=ttl_hours, value=record)
+            return record
+        
+        if response.status_code == 200:
+            record = crossref_record(response.json().get('message', {}))
+            ttl_hours = CROSSREF_TTL_HOURS
+        elif response.status_code == 404:
+            record = {"found": False, "doi": doi, "http_code": 404}
+            ttl_hours = NOT_FOUND_TTL_HOURS
+        else:
+            return None
+        
+        if self.background and not record['found']:
+            return record
+        self.cache.set(cache_key, record, ttl_hours=ttl_hours, **response_validators(response))
+        return record
     
     async def verify_doi(self, doi: str) -> VerificationResult:
-        """DOIの検証"""
+        """DOIの検証（Crossref に登録があればそのレコードで確認、なければ doi.org に問い合わせる）"""
         # 形式チェック
         if not re.match(r'^10\.\d{4,9}/[-._;()/:A-Z0-9]+$', doi, re.IGNORECASE):
             return VerificationResult(
@@ -120,16 +1387,39 @@ class Verifier:
                 detail=f'Invalid DOI format: {doi}'
             )
         
+        # Crossref のレコード（リトラクション確認・位置づけ分析と共有）
+        try:
+            record = await self.resolve_crossref(doi)
+        except Exception:
+            record = None
+        if record and record.get('found'):
+            result = VerificationResult(
+                kind='doi',
+                status='ok',
+                detail=f'DOI registered with Crossref ({record.get("crossref_type")})',
+                http_code=200
+            )
+            result.stale = record.get('stale', False)
+            return result
+        
         # キャッシュチェック
         cache_key = f"doi:{doi}"
         cached = self.cache.get(cache_key)
         if cached:
-            return VerificationResult(**cached)
+            return VerificationResult.from_dict(cached)
+        stale = self._stale_result(cache_key, lambda verifier: verifier.verify_doi(doi))
+        if stale:
+            return stale
         
+        # 結果は同時に待っていた呼び出し元で共有されるので、それぞれ複製を返す
+        return copy.copy(await single_flight(cache_key, lambda: self._fetch_doi(doi, cache_key), self._flights))
+    
+    async def _fetch_doi(self, doi: str, cache_key: str) -> VerificationResult:
+        """doi.org に問い合わせて結果をキャッシュに保存"""
         # DOI.orgへのリクエスト
         url = f"https://doi.org/{doi}"
         try:
-            response = await self.client.head(url, timeout=10.0)
+            response = await self._request('HEAD', url, timeout=10.0)
             
             if response.status_code in [200, 301, 302, 303]:
                 result = VerificationResult(
@@ -153,16 +1443,24 @@ class Verifier:
                     http_code=response.status_code
                 )
             
-            # キャッシュに保存
-            self.cache.set(cache_key, result.to_dict(), ttl_hours=168)  # 1週間
+            # キャッシュに保存（見つからない結果は短く）
+            if response.status_code not in RETRY_STATUSES and (result.status == 'ok' or not self.background):
+                ttl_hours = NOT_FOUND_TTL_HOURS if response.status_code == 404 else 168  # 1週間
+                self.cache.set(cache_key, result.to_dict(), ttl_hours=ttl_hours)
             return result
         
         except httpx.TimeoutException:
-            return VerificationResult(
+            return self._cache_negative(cache_key, VerificationResult(
                 kind='doi',
                 status='warn',
                 detail='Request timeout'
-            )
+            ))
+        except httpx.TransportError as e:
+            return self._cache_negative(cache_key, VerificationResult(
+                kind='doi',
+                status='warn',
+                detail=f'Error: {str(e)}'
+            ))
         except Exception as e:
             return VerificationResult(
                 kind='doi',
@@ -175,11 +1473,19 @@ class Verifier:
         cache_key = f"url:{url}"
         cached = self.cache.get(cache_key)
         if cached:
-            return VerificationResult(**cached)
+            return VerificationResult.from_dict(cached)
+        stale = self._stale_result(cache_key, lambda verifier: verifier.verify_url(url))
+        if stale:
+            return stale
         
+        # 結果は同時に待っていた呼び出し元で共有されるので、それぞれ複製を返す
+        return copy.copy(await single_flight(cache_key, lambda: self._fetch_url(url, cache_key), self._flights))
+    
+    async def _fetch_url(self, url: str, cache_key: str) -> VerificationResult:
+        """URLに問い合わせて結果をキャッシュに保存"""
         try:
             # HEADリクエスト
-            response = await self.client.head(url, timeout=10.0)
+            response = await self._request('HEAD', url, timeout=10.0)
             
             if response.status_code == 200:
                 result = VerificationResult(
@@ -212,15 +1518,23 @@ class Verifier:
                     http_code=response.status_code
                 )
             
-            self.cache.set(cache_key, result.to_dict(), ttl_hours=24)
+            if response.status_code not in RETRY_STATUSES and (result.status == 'ok' or not self.background):
+                ttl_hours = NOT_FOUND_TTL_HOURS if response.status_code in [404, 410] else 24
+                self.cache.set(cache_key, result.to_dict(), ttl_hours=ttl_hours)
             return result
         
         except httpx.TimeoutException:
-            return VerificationResult(
+            return self._cache_negative(cache_key, VerificationResult(
                 kind='url',
                 status='warn',
                 detail='Request timeout'
-            )
+            ))
+        except httpx.TransportError as e:
+            return self._cache_negative(cache_key, VerificationResult(
+                kind='url',
+                status='warn',
+                detail=f'Error: {str(e)}'
+            ))
         except Exception as e:
             return VerificationResult(
                 kind='url',
@@ -228,103 +1542,231 @@ class Verifier:
                 detail=f'Error: {str(e)}'
             )
     
-    async def verify_arxiv(self, arxiv_id: str) -> VerificationResult:
-        """arXiv IDの検証"""
-        # 形式チェック
-        if not (re.match(r'^\d{4}\.\d{4,5}(v\d+)?$', arxiv_id) or 
+    @staticmethod
+    def _invalid_arxiv_id(arxiv_id: str) -> Optional[VerificationResult]:
+        """arXiv IDの形式チェック（不正なら fail の結果）"""
+        if (re.match(r'^\d{4}\.\d{4,5}(v\d+)?$', arxiv_id) or 
                 re.match(r'^[a-z-]+/\d{7}$', arxiv_id, re.IGNORECASE)):
-            return VerificationResult(
-                kind='arxiv',
-                status='fail',
-                detail=f'Invalid arXiv ID format: {arxiv_id}'
-            )
+            return None
+        return VerificationResult(
+            kind='arxiv',
+            status='fail',
+            detail=f'Invalid arXiv ID format: {arxiv_id}'
+        )
+    
+    @staticmethod
+    def _invalid_pubmed_id(pubmed_id: str) -> Optional[VerificationResult]:
+        """PubMed IDの形式チェック（不正なら fail の結果）"""
+        if re.match(r'^\d+$', pubmed_id):
+            return None
+        return VerificationResult(
+            kind='pubmed',
+            status='fail',
+            detail=f'Invalid PubMed ID format: {pubmed_id}'
+        )
+    
+    async def verify_arxiv(self, arxiv_id: str) -> VerificationResult:
+        """arXiv IDの検証（同時に検証される他のIDと1リクエストにまとめる）"""
+        invalid = self._invalid_arxiv_id(arxiv_id)
+        if invalid:
+            return invalid
         
         cache_key = f"arxiv:{arxiv_id}"
         cached = self.cache.get(cache_key)
         if cached:
-            return VerificationResult(**cached)
-        
-        # arXiv APIで確認
-        api_url = f"http://export.arxiv.org/api/query?id_list={arxiv_id}"
-        try:
-            response = await self.client.get(api_url, timeout=10.0)
-            
-            if response.status_code == 200 and '<entry>' in response.text:
-                result = VerificationResult(
-                    kind='arxiv',
-                    status='ok',
-                    detail='arXiv ID verified',
-                    http_code=200
-                )
-            else:
-                result = VerificationResult(
-                    kind='arxiv',
-                    status='fail',
-                    detail='arXiv ID not found',
-                    http_code=response.status_code
-                )
-            
-            self.cache.set(cache_key, result.to_dict(), ttl_hours=168)
-            return result
+            return VerificationResult.from_dict(cached)
+        stale = self._stale_result(cache_key, lambda verifier: verifier.verify_arxiv(arxiv_id))
+        if stale:
+            return stale
         
-        except Exception as e:
-            return VerificationResult(
-                kind='arxiv',
-                status='warn',
-                detail=f'Error: {str(e)}'
-            )
+        # 結果は同時に待っていた呼び出し元で共有されるので、それぞれ複製を返す
+        return copy.copy(await single_flight(cache_key, lambda: self._arxiv_batcher.submit(arxiv_id), self._flights))
+    
+    async def verify_arxiv_many(self, arxiv_ids: Iterable[str]) -> Dict[str, VerificationResult]:
+        """複数の arXiv ID をまとめて検証（ARXIV_BATCH_SIZE 件ずつ1リクエスト）"""
+        return await self._verify_many_ids(
+            arxiv_ids, 'arxiv', self._invalid_arxiv_id, self._fetch_arxiv, ARXIV_BATCH_SIZE
+        )
     
     async def verify_pubmed(self, pubmed_id: str) -> VerificationResult:
-        """PubMed IDの検証"""
-        if not re.match(r'^\d+$', pubmed_id):
-            return VerificationResult(
-                kind='pubmed',
-                status='fail',
-                detail=f'Invalid PubMed ID format: {pubmed_id}'
-            )
+        """PubMed IDの検証（同時に検証される他のIDと1リクエストにまとめる）"""
+        invalid = self._invalid_pubmed_id(pubmed_id)
+        if invalid:
+            return invalid
         
         cache_key = f"pubmed:{pubmed_id}"
         cached = self.cache.get(cache_key)
         if cached:
-            return VerificationResult(**cached)
+            return VerificationResult.from_dict(cached)
+        stale = self._stale_result(cache_key, lambda verifier: verifier.verify_pubmed(pubmed_id))
+        if stale:
+            return stale
+        
+        # 結果は同時に待っていた呼び出し元で共有されるので、それぞれ複製を返す
+        return copy.copy(await single_flight(cache_key, lambda: self._pubmed_batcher.submit(pubmed_id), self._flights))
+    
+    async def verify_pubmed_many(self, pubmed_ids: Iterable[str]) -> Dict[str, VerificationResult]:
+        """複数の PubMed ID をまとめて検証（PUBMED_BATCH_SIZE 件ずつ1リクエスト）"""
+        return await self._verify_many_ids(
+            pubmed_ids, 'pubmed', self._invalid_pubmed_id, self._fetch_pubmed, PUBMED_BATCH_SIZE
+        )
+    
+    async def _verify_many_ids(
+        self,
+        ids: Iterable[str],
+        kind: str,
+        invalid_id: Callable[[str], Optional[VerificationResult]],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, VerificationResult]]],
+        batch_size: int
+    ) -> Dict[str, VerificationResult]:
+        """形式チェック → キャッシュ → 残りを batch_size 件ずつ取得"""
+        results: Dict[str, VerificationResult] = {}
+        valid = []
+        for id_ in dict.fromkeys(ids):
+            invalid = invalid_id(id_)
+            if invalid:
+                results[id_] = invalid
+            else:
+                valid.append(id_)
         
-        # PubMed E-utilitiesで確認
-        api_url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?db=pubmed&id={pubmed_id}&retmode=json"
+        cached = self.cache.get_many(f"{kind}:{id_}" for id_ in valid)
+        missing = []
+        for id_ in valid:
+            entry = cached.get(f"{kind}:{id_}")
+            if entry:
+                results[id_] = VerificationResult.from_dict(entry)
+            else:
+                missing.append(id_)
+        
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        for fetched in await asyncio.gather(*(fetch(batch) for batch in batches)):
+            results.update(fetched)
+        return results
+    
+    async def _fetch_arxiv(self, arxiv_ids: List[str]) -> Dict[str, VerificationResult]:
+        """arXiv API に id_list でまとめて問い合わせ、IDごとの結果にする"""
+        api_url = "http://export.arxiv.org/api/query"
+        params = {"id_list": ",".join(arxiv_ids), "max_results": len(arxiv_ids)}
         try:
-            response = await self.client.get(api_url, timeout=10.0)
+            response = await self._request('GET', api_url, params=params, timeout=10.0)
             
+            results = {}
             if response.status_code == 200:
-                data = response.json()
-                if 'result' in data and pubmed_id in data['result']:
-                    result = VerificationResult(
-                        kind='pubmed',
-                        status='ok',
-                        detail='PubMed ID verified',
-                        http_code=200
-                    )
-                else:
-                    result = VerificationResult(
-                        kind='pubmed',
-                        status='fail',
-                        detail='PubMed ID not found'
-                    )
+                # <id>http://arxiv.org/abs/2301.00001v1</id> → バージョン付き・なしの両方で照合
+                found = set()
+                root = ET.fromstring(response.content)
+                for entry_id in root.iterfind('{http://www.w3.org/2005/Atom}entry/{http://www.w3.org/2005/Atom}id'):
+                    _, sep, found_id = (entry_id.text or '').partition('/abs/')
+                    if sep:
+                        found.add(found_id)
+                        found.add(re.sub(r'v\d+$', '', found_id))
+                for arxiv_id in arxiv_ids:
+                    if arxiv_id in found:
+                        results[arxiv_id] = VerificationResult(
+                            kind='arxiv',
+                            status='ok',
+                            detail='arXiv ID verified',
+                            http_code=200
+                        )
+                    else:
+                        results[arxiv_id] = VerificationResult(
+                            kind='arxiv',
+                            status='fail',
+                            detail='arXiv ID not found',
+                            http_code=200
+                        )
             else:
-                result = VerificationResult(
-                    kind='pubmed',
+                for arxiv_id in arxiv_ids:
+                    results[arxiv_id] = VerificationResult(
+                        kind='arxiv',
+                        status='warn',
+                        detail=f'API error: {response.status_code}',
+                        http_code=response.status_code
+                    )
+            
+            if response.status_code not in RETRY_STATUSES:
+                self._cache_results('arxiv', results, ttl_hours=168)
+            return results
+        
+        except Exception as e:
+            results = {
+                arxiv_id: VerificationResult(
+                    kind='arxiv',
                     status='warn',
-                    detail=f'API error: {response.status_code}',
-                    http_code=response.status_code
+                    detail=f'Error: {str(e)}'
                 )
+                for arxiv_id in arxiv_ids
+            }
+            if isinstance(e, httpx.TransportError):
+                results = self._cache_errors('arxiv', results)
+            return results
+    
+    async def _fetch_pubmed(self, pubmed_ids: List[str]) -> Dict[str, VerificationResult]:
+        """E-utilities の esummary に id をまとめて問い合わせ、IDごとの結果にする
+        
+        検証子は応答ごとなので、1件だけの問い合わせのときに限り保存・再検証に使う。
+        """
+        api_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+        params = {"db": "pubmed", "id": ",".join(pubmed_ids), "retmode": "json"}
+        single = len(pubmed_ids) == 1
+        entry = self.cache.get_entry(f"pubmed:{pubmed_ids[0]}") if single else None
+        try:
+            response = await self._request(
+                'GET', api_url, params=params, headers=conditional_headers(entry), timeout=10.0
+            )
             
-            self.cache.set(cache_key, result.to_dict(), ttl_hours=168)
-            return result
+            if response.status_code == 304 and entry:
+                result = VerificationResult.from_dict(entry['value'])
+                self.cache.refresh(
+                    f"pubmed:{pubmed_ids[0]}", ttl_hours=self._result_ttl(result, 168), value=entry['value']
+                )
+                return {pubmed_ids[0]: result}
+            
+            results = {}
+            if response.status_code == 200:
+                summaries = response.json().get('result', {})
+                for pubmed_id in pubmed_ids:
+                    # 存在しないIDは {"uid": ..., "error": "cannot get document summary"} になる
+                    summary = summaries.get(pubmed_id)
+                    if isinstance(summary, dict) and 'error' not in summary:
+                        results[pubmed_id] = VerificationResult(
+                            kind='pubmed',
+                            status='ok',
+                            detail='PubMed ID verified',
+                            http_code=200
+                        )
+                    else:
+                        results[pubmed_id] = VerificationResult(
+                            kind='pubmed',
+                            status='fail',
+                            detail='PubMed ID not found'
+                        )
+            else:
+                for pubmed_id in pubmed_ids:
+                    results[pubmed_id] = VerificationResult(
+                        kind='pubmed',
+                        status='warn',
+                        detail=f'API error: {response.status_code}',
+                        http_code=response.status_code
+                    )
+            
+            if response.status_code not in RETRY_STATUSES:
+                validators = response_validators(response) if single else {}
+                self._cache_results('pubmed', results, ttl_hours=168, **validators)
+            return results
         
         except Exception as e:
-            return VerificationResult(
-                kind='pubmed',
-                status='warn',
-                detail=f'Error: {str(e)}'
-            )
+            results = {
+                pubmed_id: VerificationResult(
+                    kind='pubmed',
+                    status='warn',
+                    detail=f'Error: {str(e)}'
+                )
+                for pubmed_id in pubmed_ids
+            }
+            if isinstance(e, httpx.TransportError):
+                results = self._cache_errors('pubmed', results)
+            return results
     
     async def check_retraction(self, doi: Optional[str] = None) -> VerificationResult:
         """リトラクション（撤回）チェック"""
@@ -335,58 +1777,47 @@ class Verifier:
                 detail='No DOI provided, skipping retraction check'
             )
         
-        cache_key = f"retraction:{doi}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return VerificationResult(**cached)
-        
-        # Crossref APIでrelationをチェック
-        api_url = f"https://api.crossref.org/works/{doi}"
+        # Crossref のレコードの relation をチェック
         try:
-            response = await self.client.get(api_url, timeout=10.0)
-            
-            if response.status_code == 200:
-                data = response.json()
-                message = data.get('message', {})
-                
-                # リトラクション関連のrelationをチェック
-                relations = message.get('relation', {})
-                is_retracted = False
-                retraction_info = []
-                
-                for rel_type in ['is-correction-of', 'is-retracted-by', 'has-correction']:
-                    if rel_type in relations:
-                        is_retracted = True
-                        retraction_info.append(rel_type)
-                
-                if is_retracted:
-                    result = VerificationResult(
-                        kind='retraction',
-                        status='fail',
-                        detail=f'⚠️ RETRACTED or CORRECTED: {", ".join(retraction_info)}'
-                    )
-                else:
-                    result = VerificationResult(
-                        kind='retraction',
-                        status='ok',
-                        detail='No retraction found'
-                    )
-            else:
-                result = VerificationResult(
-                    kind='retraction',
-                    status='warn',
-                    detail='Could not check retraction status'
-                )
-            
-            self.cache.set(cache_key, result.to_dict(), ttl_hours=168)
-            return result
-        
+            record = await self.resolve_crossref(doi)
         except Exception as e:
             return VerificationResult(
                 kind='retraction',
                 status='warn',
                 detail=f'Error: {str(e)}'
             )
+        
+        if not record or not record.get('found'):
+            result = VerificationResult(
+                kind='retraction',
+                status='warn',
+                detail='Could not check retraction status'
+            )
+            result.stale = bool(record and record.get('stale'))
+            return result
+        
+        retraction_info = retraction_relations(record)
+        if is_retracted_record(record):
+            result = VerificationResult(
+                kind='retraction',
+                status='fail',
+                detail=f'⚠️ RETRACTED: {", ".join(retraction_info) or "retraction notice"}'
+            )
+        elif retraction_info:
+            # 訂正だけなら撤回ではないので警告にとどめる
+            result = VerificationResult(
+                kind='retraction',
+                status='warn',
+                detail=f'CORRECTED: {", ".join(retraction_info)}'
+            )
+        else:
+            result = VerificationResult(
+                kind='retraction',
+                status='ok',
+                detail='No retraction found'
+            )
+        result.stale = record.get('stale', False)
+        return result
     
     async def find_alternative_urls(self, doi: str, title: Optional[str] = None) -> List[str]:
         """死リンク時の代替URL探索"""
@@ -396,7 +1827,7 @@ class Verifier:
         try:
             email = "refsys@localhost"  # 実際は設定から取得
             api_url = f"https://api.unpaywall.org/v2/{doi}?email={email}"
-            response = await self.client.get(api_url, timeout=10.0)
+            response = await self._request('GET', api_url, timeout=10.0)
             
             if response.status_code == 200:
                 data = response.json()
@@ -417,54 +1848,197 @@ class Verifier:
         return alternatives
 
 
+def check_rows(work_id: str, results: Dict[str, VerificationResult]) -> List[Dict[str, Any]]:
+    """検証結果を CheckDAO.create_many 用の行に変換"""
+    return [
+        {
+            "work_id": work_id,
+            "kind": result.kind,
+            "status": result.status,
+            "detail": result.detail,
+            "http_code": result.http_code
+        }
+        for result in results.values()
+    ]
+
+
+async def _run_check(
+    kind: str,
+    check: Awaitable[VerificationResult],
+    timeout: Optional[float]
+) -> VerificationResult:
+    """1つの検証をタイムアウト付きで実行（例外は warn の結果にする）"""
+    token = None
+    if timeout is not None:
+        token = _check_deadline.set(asyncio.get_running_loop().time() + timeout)
+    try:
+        return await asyncio.wait_for(check, timeout)
+    except asyncio.TimeoutError:
+        return VerificationResult(
+            kind=kind,
+            status='warn',
+            detail=f'Check timed out after {timeout:g}s'
+        )
+    except Exception as e:
+        return VerificationResult(
+            kind=kind,
+            status='warn',
+            detail=f'Error: {str(e)}'
+        )
+    finally:
+        if token is not None:
+            _check_deadline.reset(token)
+
+
+async def _verify_url_with_fallback(
+    verifier: Verifier,
+    work_data: Dict[str, Any],
+    timeout: Optional[float]
+) -> VerificationResult:
+    """URL検証。リンク切れでDOIがある場合だけ、続けて代替URLを探す"""
+    result = await _run_check('url', verifier.verify_url(work_data['URL']), timeout)
+    
+    if result.status == 'fail' and work_data.get('DOI'):
+        try:
+            alternatives = await asyncio.wait_for(
+                verifier.find_alternative_urls(work_data['DOI'], work_data.get('title')),
+                timeout
+            )
+        except Exception:
+            alternatives = []
+        if alternatives:
+            result.alternative_urls = alternatives
+    
+    return result
+
+
 async def verify_work(
     work_data: Dict[str, Any],
-    verifier: Optional[Verifier] = None
+    verifier: Optional[Verifier] = None,
+    concurrent: bool = True,
+    check_timeout: Optional[float] = DEFAULT_CHECK_TIMEOUT
 ) -> Dict[str, VerificationResult]:
-    """文献の全検証を実行"""
-    results = {}
+    """文献の全検証を実行
     
+    concurrent=True では互いに独立な検証（DOI / URL / arXiv / PubMed / リトラクション）を
+    asyncio.gather で同時に実行し、所要時間を最も遅い1件分にする。代替URLの検索は
+    URL検証が失敗したときだけ、その後に続けて行う。
+    各検証は check_timeout 秒で打ち切り、warn として返す（None なら無制限）。
+    """
     close_verifier = False
     if verifier is None:
         verifier = Verifier()
         await verifier.__aenter__()
         close_verifier = True
     
-    try:
-        # DOI検証
-        if work_data.get('DOI'):
-            results['doi'] = await verifier.verify_doi(work_data['DOI'])
-        
-        # URL検証
-        if work_data.get('URL'):
-            results['url'] = await verifier.verify_url(work_data['URL'])
-        
-        # arXiv検証
-        if work_data.get('arxiv_id'):
-            results['arxiv'] = await verifier.verify_arxiv(work_data['arxiv_id'])
-        
-        # PubMed検証
-        if work_data.get('pubmed_id'):
-            results['pubmed'] = await verifier.verify_pubmed(work_data['pubmed_id'])
-        
-        # リトラクションチェック
-        if work_data.get('DOI'):
-            results['retraction'] = await verifier.check_retraction(work_data['DOI'])
-            
-            # URLが死んでいて、DOIがある場合は代替URLを探す
-            if results.get('url') and results['url'].status == 'fail':
-                alternatives = await verifier.find_alternative_urls(
-                    work_data['DOI'],
-                    work_data.get('title')
-                )
-                if alternatives:
-                    results['url'].alternative_urls = alternatives
+    # 検証の種類ごとのコルーチン（結果はこの順に並べる）
+    checks: Dict[str, Awaitable[VerificationResult]] = {}
+    if work_data.get('DOI'):
+        checks['doi'] = _run_check('doi', verifier.verify_doi(work_data['DOI']), check_timeout)
+    if work_data.get('URL'):
+        checks['url'] = _verify_url_with_fallback(verifier, work_data, check_timeout)
+    if work_data.get('arxiv_id'):
+        checks['arxiv'] = _run_check('arxiv', verifier.verify_arxiv(work_data['arxiv_id']), check_timeout)
+    if work_data.get('pubmed_id'):
+        checks['pubmed'] = _run_check('pubmed', verifier.verify_pubmed(work_data['pubmed_id']), check_timeout)
+    if work_data.get('DOI'):
+        checks['retraction'] = _run_check('retraction', verifier.check_retraction(work_data['DOI']), check_timeout)
     
+    try:
+        if concurrent:
+            outcomes = await asyncio.gather(*checks.values())
+        else:
+            outcomes = [await check for check in checks.values()]
     finally:
         if close_verifier:
             await verifier.__aexit__(None, None, None)
     
-    return results
+    return dict(zip(checks.keys(), outcomes))
+
+
+async def _aiter_works(
+    works: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """同期・非同期どちらのイテラブルも非同期に反復する"""
+    if hasattr(works, '__aiter__'):
+        async for work in works:
+            yield work
+    else:
+        for work in works:
+            yield work
+
+
+async def verify_many(
+    works: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    verifier: Optional[Verifier] = None,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    per_host_limit: int = DEFAULT_PER_HOST_CONCURRENCY,
+    check_timeout: Optional[float] = DEFAULT_CHECK_TIMEOUT
+) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, VerificationResult]]]:
+    """多数の文献を同時に検証し、終わった順に (文献データ, 検証結果) を返す
+    
+    同時に検証する文献は concurrency 件まで。works は必要な分だけ読み進めるので、
+    WorkDAO.iter_items のような非同期ジェネレータも渡せる（メモリ使用量は一定）。
+    ホストごとの同時リクエスト数は Verifier の per_host_limit で抑える
+    （verifier を渡した場合はその設定を使う）。
+    """
+    close_verifier = False
+    if verifier is None:
+        verifier = Verifier(per_host_limit=per_host_limit)
+        await verifier.__aenter__()
+        close_verifier = True
+    
+    source = _aiter_works(works)
+    source_lock = asyncio.Lock()
+    done = object()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    
+    async def next_work():
+        async with source_lock:
+            try:
+                return await source.__anext__()
+            except StopAsyncIteration:
+                return done
+    
+    async def worker():
+        while True:
+            work = await next_work()
+            if work is done:
+                return
+            try:
+                results = await verify_work(work, verifier, check_timeout=check_timeout)
+            except Exception as e:
+                print(f"Verification error for {work.get('id')}: {e}")
+                results = {}
+            await queue.put((work, results))
+    
+    async def run_workers():
+        outcomes = await asyncio.gather(
+            *(worker() for _ in range(max(1, concurrency))),
+            return_exceptions=True
+        )
+        await queue.put(done)
+        errors = [o for o in outcomes if isinstance(o, BaseException)]
+        if errors:
+            raise errors[0]
+    
+    runner = asyncio.create_task(run_workers())
+    try:
+        while True:
+            entry = await queue.get()
+            if entry is done:
+                break
+            yield entry
+        await runner
+    finally:
+        if not runner.done():
+            runner.cancel()
+            try:
+                await runner
+            except (asyncio.CancelledError, Exception):
+                pass
+        if close_verifier:
+            await verifier.__aexit__(None, None, None)
 
 
 if __name__ == "__main__":
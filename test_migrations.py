@@ -0,0 +1,19 @@
+# マイグレーション適用後の実行計画テスト（pytest）
+import sqlite3
+
+from refsys.db.schema import ALL_TABLES, CREATE_INDEXES
+from refsys.db.migrations import LATEST_VERSION, apply_migrations, check_query_plans, get_schema_version
+
+
+def test_query_plans_use_indexes(tmp_path):
+    conn = sqlite3.connect(tmp_path / "refsys.db")
+    try:
+        for sql in ALL_TABLES + CREATE_INDEXES:
+            conn.execute(sql)
+        conn.commit()
+        apply_migrations(conn)
+        
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert check_query_plans(conn) == []
+    finally:
+        conn.close()
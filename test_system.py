@@ -1,6 +1,6 @@
 # テスト用スクリプト
 import asyncio
-from refsys.db import init_database
+from refsys.db import init_database, run_with_pool
 from refsys.ingest import parse_csl_from_json_file, deduplicate_items
 from refsys.verify import verify_work, Verifier
 from refsys.position import PositionAnalyzer, format_position_summary
@@ -28,11 +28,11 @@ async def main():
     
     # 4. 位置づけ分析
     print("4. 位置づけ分析...")
-    analyzer = PositionAnalyzer()
-    for item in unique_items[:1]:  # 最初の1件だけテスト
-        metadata = await analyzer.analyze_work(item.to_dict())
-        print(format_position_summary(metadata))
-        print()
+    async with PositionAnalyzer() as analyzer:
+        for item in unique_items[:1]:  # 最初の1件だけテスト
+            metadata = await analyzer.analyze_work(item.to_dict())
+            print(format_position_summary(metadata))
+            print()
     
     # 5. 実在性検証
     print("5. 実在性検証...")
@@ -83,4 +83,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_with_pool(main())